@@ -0,0 +1,104 @@
+import argparse
+import json
+import os
+import statistics
+import time
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from lib.analytics import BACKENDS, get_backend, load_set_columns
+from lib.models import User, Exercise, WorkoutExercise
+from benchmarks.screens import database_path, build_database
+
+# Times the lib.analytics backends against each other on generated
+# databases: loading one user's sets into columns, then computing volume
+# per muscle group, exercise frequency, daily volume with a moving average
+# and the estimated 1RM curve for their most logged exercise.
+#
+#   python -m benchmarks.analytics --sizes 10000 100000 --users 1
+#
+# Without NumPy installed only the pure-Python backend is measured.
+
+
+def timed(function, repeat):
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def compute_all(backend, columns, muscle_groups, exercise_id, window):
+
+    backend.volume_by_muscle_group(columns, muscle_groups)
+    backend.exercise_frequency(columns)
+    daily = backend.daily_volume(columns)
+    backend.moving_average([volume for _, volume in daily], window)
+    curve = backend.one_rep_max_curve(columns, exercise_id)
+    backend.moving_average([estimate for _, estimate in curve], window)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Compare the NumPy and pure-Python analytics backends")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                        help="total workouts per generated database")
+    parser.add_argument('--users', type=int, default=1)
+    parser.add_argument('--exercises-per-workout', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--window', type=int, default=4)
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+
+    for size in args.sizes:
+        path = database_path(args.data_dir, size, args.users, args.seed)
+        print(f"Preparing {path}...")
+        engine = build_database(path, size, args.users, args.exercises_per_workout, args.seed)
+
+        with Session(engine) as session:
+            user_id = session.scalar(select(User.id).order_by(User.id))
+            muscle_groups = dict(session.execute(select(Exercise.id, Exercise.muscle_group)).all())
+            exercise_id = session.scalar(
+                select(WorkoutExercise.exercise_id)
+                .group_by(WorkoutExercise.exercise_id)
+                .order_by(func.count().desc())
+                .limit(1)
+            )
+
+            for name in BACKENDS:
+                backend = get_backend(name)
+                load_ms, columns = timed(lambda: load_set_columns(session, user_id, backend), args.repeat)
+                compute_ms, _ = timed(
+                    lambda: compute_all(backend, columns, muscle_groups, exercise_id, args.window),
+                    args.repeat
+                )
+                result = {
+                    'size': size,
+                    'backend': name,
+                    'sets': len(columns['day']),
+                    'load_ms': load_ms,
+                    'compute_ms': compute_ms,
+                }
+                results.append(result)
+                print(
+                    f"  {size:>9} {name:<8} {result['sets']:>9,} sets"
+                    f" load {load_ms:>9.1f} ms  compute {compute_ms:>9.1f} ms"
+                )
+
+        engine.dispose()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+# Load test for lib.api: --concurrency clients, each on its own keep-alive
+# connection, send a read-heavy mix of requests for --seconds and report
+# requests/sec and latency percentiles overall and per endpoint.
+#
+#   python -m lib.api --port 8080 &
+#   python -m benchmarks.api_load --url http://127.0.0.1:8080 --concurrency 50 --seconds 10
+#
+# --spawn starts a server on --url itself (against FITNESS_TRACKER_DATABASE_URL)
+# and stops it afterwards. --write-ratio > 0 logs real workouts, so point it
+# at a scratch database.
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+READ_MIX = (
+    ('stats', 0.4),
+    ('workouts', 0.3),
+    ('search', 0.2),
+    ('user', 0.1),
+)
+
+SEARCH_TERMS = ('bench', 'squat', 'curl', 'row', 'press', 'raise', 'deadlift', 'pull')
+
+
+class Connection:
+
+    def __init__(self, host, port):
+
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+
+def next_request(rng, user_ids, write_ratio):
+
+    user_id = rng.choice(user_ids)
+    if rng.random() < write_ratio:
+        return 'log', 'POST', f"/users/{user_id}/workouts", {
+            'exercises': [{'exercise_id': rng.randint(1, 20), 'sets': 3, 'reps': rng.randint(5, 12), 'weight': 100.0}]
+        }
+
+    kind = rng.choices([name for name, _ in READ_MIX], weights=[weight for _, weight in READ_MIX])[0]
+    if kind == 'stats':
+        return kind, 'GET', f"/users/{user_id}/stats", None
+    if kind == 'workouts':
+        return kind, 'GET', f"/users/{user_id}/workouts?limit=10", None
+    if kind == 'search':
+        return kind, 'GET', f"/exercises?q={rng.choice(SEARCH_TERMS)}", None
+    return kind, 'GET', f"/users/{user_id}", None
+
+
+async def client(host, port, user_ids, stop_at, write_ratio, seed, latencies, errors):
+
+    rng = random.Random(seed)
+    connection = Connection(host, port)
+    try:
+        while time.perf_counter() < stop_at:
+            kind, method, path, payload = next_request(rng, user_ids, write_ratio)
+            start = time.perf_counter()
+            try:
+                status = await connection.request(method, path, payload)
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                connection.close()
+                errors[kind] = errors.get(kind, 0) + 1
+                continue
+            latencies.setdefault(kind, []).append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                errors[kind] = errors.get(kind, 0) + 1
+    finally:
+        connection.close()
+
+
+def percentile(values, fraction):
+
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(values, seconds):
+
+    return {
+        'requests': len(values),
+        'requests_per_second': len(values) / seconds,
+        'p50_ms': percentile(values, 0.50),
+        'p95_ms': percentile(values, 0.95),
+        'p99_ms': percentile(values, 0.99),
+        'max_ms': max(values),
+        'mean_ms': statistics.fmean(values),
+    }
+
+
+async def wait_until_ready(host, port, timeout=15.0):
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        connection = Connection(host, port)
+        try:
+            if await connection.request('GET', '/health') == 200:
+                return
+        except OSError:
+            await asyncio.sleep(0.2)
+        finally:
+            connection.close()
+    raise RuntimeError(f"API on {host}:{port} did not come up within {timeout:.0f}s")
+
+
+async def fetch_user_ids(host, port):
+
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET /users HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode('latin-1'))
+    response = await reader.read()
+    writer.close()
+    return [user['id'] for user in json.loads(response.split(b'\r\n\r\n', 1)[1])]
+
+
+async def run(args):
+
+    url = urlsplit(args.url)
+    host, port = url.hostname, url.port or 80
+
+    await wait_until_ready(host, port)
+    user_ids = await fetch_user_ids(host, port)
+    if not user_ids:
+        raise RuntimeError("The database has no users; seed it first (python -m lib.seed --synthetic)")
+
+    latencies, errors = {}, {}
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client(host, port, user_ids, start + args.seconds, args.write_ratio, args.seed + index, latencies, errors)
+        for index in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    everything = [value for values in latencies.values() for value in values]
+    if not everything:
+        raise RuntimeError(f"No successful requests ({sum(errors.values())} errors)")
+
+    report = {
+        'args': vars(args),
+        'seconds': elapsed,
+        'errors': errors,
+        'overall': summarize(everything, elapsed),
+        'endpoints': {kind: summarize(values, elapsed) for kind, values in sorted(latencies.items())},
+    }
+
+    overall = report['overall']
+    print(f"{overall['requests']:,} requests in {elapsed:.1f}s with {args.concurrency} clients"
+          f" ({sum(errors.values())} errors)")
+    print(f"  {'':<10} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, row in [('overall', overall)] + list(report['endpoints'].items()):
+        print(f"  {name:<10} {row['requests_per_second']:>9.1f} {row['p50_ms']:>8.1f}"
+              f" {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}")
+    return report
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Load test the fitness tracker HTTP API")
+    parser.add_argument('--url', default='http://127.0.0.1:8080')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--write-ratio', type=float, default=0.0, help="share of requests that log a workout")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--spawn', action='store_true', help="start a local server for the run")
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        url = urlsplit(args.url)
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'lib.api', '--host', url.hostname, '--port', str(url.port or 80)],
+            cwd=PROJECT_ROOT
+        )
+
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
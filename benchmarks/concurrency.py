@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from lib.database import Base, SQLITE_PROFILES, create_tuned_engine
+from lib.models import Workout, WorkoutExercise
+from lib.search import install_search_index
+from lib.seed import generate_synthetic_data
+from lib.statistics import get_user_statistics
+
+# Concurrent read/write benchmark for the SQLite connection profiles.
+# Writer threads log workouts (one transaction each) while reader threads
+# compute user statistics, for a fixed duration per profile.
+#
+#   python -m benchmarks.concurrency --writers 2 --readers 4 --seconds 5
+
+
+def prepare_database(path, profile, users, workouts_per_user):
+
+    engine = create_tuned_engine(f"sqlite:///{path}", profile=profile, pool_size=16)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        install_search_index(connection)
+    with Session(engine) as session:
+        generate_synthetic_data(session, users=users, workouts_per_user=workouts_per_user, seed=7)
+    return engine
+
+
+class Worker(threading.Thread):
+
+    def __init__(self, engine, user_id, stop_at):
+
+        super().__init__(daemon=True)
+        self.engine = engine
+        self.user_id = user_id
+        self.stop_at = stop_at
+        self.latencies = []
+        self.errors = 0
+
+    def run(self):
+
+        while time.perf_counter() < self.stop_at:
+            start = time.perf_counter()
+            try:
+                self.operation()
+            except OperationalError:
+                self.errors += 1
+                continue
+            self.latencies.append((time.perf_counter() - start) * 1000)
+
+
+class Reader(Worker):
+
+    def operation(self):
+
+        with Session(self.engine) as session:
+            get_user_statistics(session, self.user_id)
+
+
+class Writer(Worker):
+
+    def operation(self):
+
+        with Session(self.engine) as session:
+            workout_id = session.execute(
+                insert(Workout).returning(Workout.id),
+                [{'user_id': self.user_id, 'workout_date': date.today()}]
+            ).scalar_one()
+            session.execute(insert(WorkoutExercise), [
+                {'workout_id': workout_id, 'exercise_id': exercise_id, 'sets': 3, 'reps': 10, 'weight': 100.0}
+                for exercise_id in range(1, 6)
+            ])
+            session.commit()
+
+
+def summarize(workers, seconds):
+
+    latencies = sorted(l for w in workers for l in w.latencies)
+    if not latencies:
+        return {'ops_per_sec': 0, 'errors': sum(w.errors for w in workers)}
+
+    return {
+        'ops_per_sec': len(latencies) / seconds,
+        'median_ms': statistics.median(latencies),
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        'errors': sum(w.errors for w in workers),
+    }
+
+
+def run_profile(profile, args):
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = prepare_database(os.path.join(tmp, 'bench.db'), profile, args.users, args.workouts)
+
+        stop_at = time.perf_counter() + args.seconds
+        readers = [Reader(engine, 1 + i % args.users, stop_at) for i in range(args.readers)]
+        writers = [Writer(engine, 1 + i % args.users, stop_at) for i in range(args.writers)]
+
+        for worker in readers + writers:
+            worker.start()
+        for worker in readers + writers:
+            worker.join()
+
+        engine.dispose()
+
+    return {
+        'reads': summarize(readers, args.seconds),
+        'writes': summarize(writers, args.seconds),
+    }
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Concurrent read/write benchmark for SQLite profiles")
+    parser.add_argument('--profiles', nargs='+', choices=sorted(SQLITE_PROFILES), default=['default', 'tuned'])
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--workouts', type=int, default=500, help="workouts per user")
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for profile in args.profiles:
+        results[profile] = run_profile(profile, args)
+        for kind in ('reads', 'writes'):
+            r = results[profile][kind]
+            print(
+                f"  {profile:<8} {kind:<6} {r['ops_per_sec']:>8.1f} ops/s"
+                f"  median {r.get('median_ms', 0):>7.2f} ms  p99 {r.get('p99_ms', 0):>8.2f} ms"
+                f"  errors {r['errors']}"
+            )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session
+
+from lib.database import Base
+from lib.models import User, Exercise, Workout, WorkoutExercise
+from lib.history import workout_history_query
+from lib.statistics import get_exercise_totals, get_top_exercises
+from lib.seed import EXERCISE_DATA
+
+# Compares EXPLAIN QUERY PLAN output and timings for the hot queries with
+# and without the indexes declared in lib/models.py.
+#
+#   python -m benchmarks.query_plans --workouts 20000
+
+
+def build_database(path, users, workouts, exercises_per_workout):
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+
+    with engine.begin() as connection:
+        exercise_rows = [
+            {'name': e['name'], 'muscle_group': mg, 'equipment_needed': e['equipment']}
+            for mg, exercises in EXERCISE_DATA.items() for e in exercises
+        ]
+        connection.execute(insert(Exercise), exercise_rows)
+        connection.execute(insert(User), [{'name': f"User {i}"} for i in range(1, users + 1)])
+
+        start = date(2020, 1, 1)
+        connection.execute(insert(Workout), [
+            {'user_id': rng.randint(1, users), 'workout_date': start + timedelta(days=rng.randint(0, 1500))}
+            for _ in range(workouts)
+        ])
+        connection.execute(insert(WorkoutExercise), [
+            {
+                'workout_id': workout_id,
+                'exercise_id': rng.randint(1, len(exercise_rows)),
+                'sets': rng.randint(1, 5),
+                'reps': rng.randint(3, 12),
+                'weight': float(rng.randint(20, 300)),
+            }
+            for workout_id in range(1, workouts + 1)
+            for _ in range(exercises_per_workout)
+        ])
+
+    return engine
+
+
+def hot_queries(user_id, exercise_id):
+
+    workout_ids = select(Workout.id).where(Workout.user_id == user_id).limit(10)
+
+    return {
+        'workout_history_page': workout_history_query(user_id).limit(11),
+        'workout_exercises_selectin': select(WorkoutExercise).where(
+            WorkoutExercise.workout_id.in_(workout_ids.scalar_subquery().self_group())
+        ),
+        'exercise_history': select(WorkoutExercise).join(Workout).where(
+            Workout.user_id == user_id,
+            WorkoutExercise.exercise_id == exercise_id
+        ).order_by(Workout.workout_date.desc()),
+        'muscle_group_filter': select(Exercise).where(Exercise.muscle_group == 'Legs'),
+    }
+
+
+def explain(connection, statement):
+
+    compiled = statement.compile(dialect=connection.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", params)
+    return [row[-1] for row in rows]
+
+
+def time_call(fn, repeat):
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def measure(engine, user_id, exercise_id, repeat):
+
+    results = {}
+    with Session(engine) as session:
+        connection = session.connection()
+        for name, statement in hot_queries(user_id, exercise_id).items():
+            results[name] = {
+                'plan': explain(connection, statement),
+                'ms': time_call(lambda: session.execute(statement).all(), repeat),
+            }
+            session.expunge_all()
+
+        results['statistics_totals'] = {
+            'ms': time_call(lambda: get_exercise_totals(session, user_id), repeat)
+        }
+        results['statistics_top_exercises'] = {
+            'ms': time_call(lambda: get_top_exercises(session, user_id), repeat)
+        }
+    return results
+
+
+def drop_indexes(engine):
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+
+def create_indexes(engine):
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+        connection.execute(text("ANALYZE"))
+
+
+def print_report(label, results):
+
+    print(f"\n=== {label} ===")
+    for name, result in results.items():
+        print(f"\n  {name}: {result['ms']:.3f} ms")
+        for line in result.get('plan', []):
+            print(f"    {line}")
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="EXPLAIN QUERY PLAN benchmark for the schema indexes")
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--workouts', type=int, default=20000)
+    parser.add_argument('--exercises-per-workout', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_database(
+            os.path.join(tmp, 'bench.db'), args.users, args.workouts, args.exercises_per_workout
+        )
+
+        drop_indexes(engine)
+        before = measure(engine, 1, 1, args.repeat)
+        create_indexes(engine)
+        after = measure(engine, 1, 1, args.repeat)
+        engine.dispose()
+
+    print_report("without indexes", before)
+    print_report("with indexes", after)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'without_indexes': before, 'with_indexes': after}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, selectinload, joinedload, contains_eager
+
+from lib.models import User, Workout, WorkoutExercise
+from lib.history import workout_history_query, load_workout_rows, get_exercise_history
+from benchmarks.screens import database_path, build_database
+
+# Memory and time of the history screens' read paths: ORM instances (how
+# the screens loaded history before) vs the slotted rows in lib.history,
+# on one user with a very long history.
+#
+#   python -m benchmarks.read_models --size 1000000 --hold 100000
+#
+# 'workouts' loads the newest --hold workouts with their exercises;
+# 'exercise_history' loads every session of the user's most logged
+# exercise. Retained is what the loaded objects still occupy afterwards.
+
+
+def orm_workouts(session, user_id, limit):
+
+    return session.scalars(
+        select(Workout)
+        .where(Workout.user_id == user_id)
+        .options(selectinload(Workout.workout_exercises).joinedload(WorkoutExercise.exercise))
+        .order_by(Workout.workout_date.desc(), Workout.id.desc())
+        .limit(limit)
+    ).all()
+
+
+def row_workouts(session, user_id, limit):
+
+    return load_workout_rows(session, session.execute(workout_history_query(user_id).limit(limit)).all())
+
+
+def orm_exercise_history(session, user_id, exercise_id):
+
+    return session.scalars(
+        select(WorkoutExercise)
+        .join(Workout, WorkoutExercise.workout_id == Workout.id)
+        .options(contains_eager(WorkoutExercise.workout))
+        .where(Workout.user_id == user_id, WorkoutExercise.exercise_id == exercise_id)
+        .order_by(Workout.workout_date.desc(), Workout.id.desc())
+    ).all()
+
+
+def row_exercise_history(session, user_id, exercise_id):
+
+    return get_exercise_history(session, user_id, exercise_id)
+
+
+CASES = {
+    'workouts': (orm_workouts, row_workouts),
+    'exercise_history': (orm_exercise_history, row_exercise_history),
+}
+
+
+def measure(engine, load, *args):
+    # Timed without tracemalloc, which slows allocation-heavy code down a lot.
+
+    with Session(engine) as session:
+        start = time.perf_counter()
+        rows = len(load(session, *args))
+        elapsed = time.perf_counter() - start
+
+    with Session(engine) as session:
+        gc.collect()
+        tracemalloc.start()
+        loaded = load(session, *args)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del loaded
+
+    return {
+        'rows': rows,
+        'wall_ms': elapsed * 1000,
+        'peak_kb': peak / 1024,
+        'retained_kb': retained / 1024,
+    }
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="ORM instances vs slotted rows on long histories")
+    parser.add_argument('--size', type=int, default=1000000, help="workouts in the user's history")
+    parser.add_argument('--hold', type=int, default=100000, help="workouts loaded at once for 'workouts'")
+    parser.add_argument('--exercises-per-workout', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=sorted(CASES))
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    path = database_path(args.data_dir, args.size, 1, args.seed)
+    print(f"Preparing {path}...")
+    engine = build_database(path, args.size, 1, args.exercises_per_workout, args.seed)
+
+    with Session(engine) as session:
+        user_id = session.scalar(select(User.id).order_by(User.id))
+        exercise_id = session.scalar(
+            select(WorkoutExercise.exercise_id)
+            .group_by(WorkoutExercise.exercise_id)
+            .order_by(func.count().desc())
+            .limit(1)
+        )
+
+    case_args = {
+        'workouts': (user_id, args.hold),
+        'exercise_history': (user_id, exercise_id),
+    }
+
+    results = []
+    print(f"  {'Case':<18} {'Read model':<10} {'Rows':>9} {'Wall ms':>9} {'Peak MiB':>9} {'Retained MiB':>13} {'B/row':>7}")
+    for case in args.cases:
+        for model, load in zip(('orm', 'rows'), CASES[case]):
+            result = measure(engine, load, *case_args[case])
+            result.update(case=case, model=model)
+            results.append(result)
+            per_row = result['retained_kb'] * 1024 / result['rows'] if result['rows'] else 0
+            print(
+                f"  {case:<18} {model:<10} {result['rows']:>9,} {result['wall_ms']:>9.0f}"
+                f" {result['peak_kb'] / 1024:>9.1f} {result['retained_kb'] / 1024:>13.1f} {per_row:>7.0f}"
+            )
+
+    engine.dispose()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import sqlalchemy
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from lib import cli
+from lib.catalog import catalog
+from lib.database import Base, create_tuned_engine
+from lib.models import User
+from lib.search import install_search_index
+from lib.seed import generate_synthetic_data
+
+# Drives the CLI screens non-interactively against generated databases and
+# records wall time, statement count and peak Python memory per screen.
+#
+#   python -m benchmarks.screens --sizes 1000 100000 --json results.json
+#   python -m benchmarks.screens --sizes 1000 --compare results.json
+#
+# Sizes are total workout rows; they are spread over --users users and each
+# database is cached in --data-dir so later runs skip generation.
+
+SCREENS = {
+    'view_statistics': (cli.view_statistics, ['']),
+    'view_workout_history': (cli.view_workout_history, ['q', '']),
+    'view_exercise_history': (cli.view_exercise_history, ['bench press', '1', '']),
+    'search_exercises': (cli.search_exercises, ['1', 'press', '']),
+}
+
+
+class ScriptedInput:
+    # Stands in for input(): returns canned answers in order, then Enter.
+
+    def __init__(self, answers):
+
+        self.answers = list(answers)
+
+    def __call__(self, prompt=''):
+
+        return self.answers.pop(0) if self.answers else ''
+
+
+class QueryCounter:
+
+    def __init__(self, engine):
+
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self.on_execute)
+
+    def on_execute(self, *args):
+
+        self.count += 1
+
+
+def database_path(data_dir, size, users, seed):
+
+    return os.path.join(data_dir, f"bench_{size}_{users}u_{seed}.db")
+
+
+def build_database(path, size, users, exercises_per_workout, seed):
+
+    engine = create_tuned_engine(f"sqlite:///{path}")
+
+    if not os.path.exists(path):
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            install_search_index(connection)
+
+        with Session(engine) as session:
+            generate_synthetic_data(
+                session,
+                users=users,
+                workouts_per_user=max(1, size // users),
+                exercises_per_workout=exercises_per_workout,
+                seed=seed
+            )
+
+    return engine
+
+
+@contextlib.contextmanager
+def scripted(answers):
+
+    original_input = builtins.input
+    builtins.input = ScriptedInput(answers)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = original_input
+
+
+def run_screen(engine, counter, user_id, screen, answers):
+
+    with Session(engine) as session:
+        cli.current_user_id = user_id
+        counter.count = 0
+        with scripted(answers):
+            screen(session)
+
+
+def measure_screen(engine, counter, user_id, screen, answers, repeat):
+
+    run_screen(engine, counter, user_id, screen, answers)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_screen(engine, counter, user_id, screen, answers)
+        timings.append((time.perf_counter() - start) * 1000)
+    queries = counter.count
+
+    tracemalloc.start()
+    run_screen(engine, counter, user_id, screen, answers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'wall_ms': statistics.median(timings),
+        'queries': queries,
+        'peak_kb': peak / 1024,
+    }
+
+
+def git_revision():
+
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    previous = {(r['size'], r['screen']): r for r in baseline['results']}
+
+    print(f"\nCompared with {baseline_path} (revision {baseline.get('revision')}):")
+    for result in results:
+        before = previous.get((result['size'], result['screen']))
+        if not before:
+            continue
+        ratio = result['wall_ms'] / before['wall_ms'] if before['wall_ms'] else 0
+        print(
+            f"  {result['size']:>9} {result['screen']:<24}"
+            f" {before['wall_ms']:>9.1f} -> {result['wall_ms']:>9.1f} ms ({ratio:.2f}x)"
+            f"  queries {before['queries']} -> {result['queries']}"
+        )
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Benchmark the CLI screens against scaled datasets")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000],
+                        help="total workout rows per database (e.g. 1000 100000 1000000)")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--exercises-per-workout', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--screens', nargs='+', choices=sorted(SCREENS), default=sorted(SCREENS))
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('--compare', help="previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+
+    for size in args.sizes:
+        path = database_path(args.data_dir, size, args.users, args.seed)
+        print(f"Preparing {path}...")
+        engine = build_database(path, size, args.users, args.exercises_per_workout, args.seed)
+        counter = QueryCounter(engine)
+
+        with Session(engine) as session:
+            user_id = session.scalar(select(User.id).order_by(User.id))
+            # Once per database, as the app does at startup; loading it
+            # inside run_screen would be measured as part of every screen.
+            catalog.load(session)
+
+        for name in args.screens:
+            screen, answers = SCREENS[name]
+            result = measure_screen(engine, counter, user_id, screen, answers, args.repeat)
+            result.update(size=size, screen=name)
+            results.append(result)
+            print(
+                f"  {size:>9} {name:<24} {result['wall_ms']:>9.1f} ms"
+                f" {result['queries']:>6} queries {result['peak_kb']:>10.0f} KiB peak"
+            )
+
+        engine.dispose()
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'sqlalchemy': sqlalchemy.__version__,
+        'args': vars(args),
+        'results': results,
+    }
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from sqlalchemy import select
+
+from lib import cli
+from lib.database import sessionLocal, session_scope
+from lib.models import User
+from benchmarks.screens import database_path, build_database, scripted
+
+# Resident memory over a long interactive session: thousands of menu
+# actions (history paging, statistics, exercise history, records,
+# progression) cycling through every user, run once with a single session
+# shared by every action (how main_menu used to work) and once with a
+# session_scope per action. Each mode runs in its own process so their
+# RSS figures don't mix.
+#
+#   python -m benchmarks.session_memory --actions 5000 --size 100000
+#
+# RSS is sampled every --sample-every actions after one warm-up pass over
+# every (user, screen) pair, so process-level caches are already full.
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ('shared', 'scoped')
+
+HISTORY_PAGES = 20
+
+ACTIONS = (
+    (cli.view_workout_history, ['n'] * HISTORY_PAGES + ['q']),
+    (cli.view_statistics, ['']),
+    (cli.view_exercise_history, ['bench press', '1', '']),
+    (cli.view_personal_records, ['']),
+    (cli.view_progression_report, ['']),
+)
+
+
+def rss_kb():
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        # No /proc (macOS): peak RSS is the closest available figure.
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_actions(mode, user_ids, count, start=0, on_action=None):
+
+    shared = sessionLocal() if mode == 'shared' else None
+    for index in range(start, start + count):
+        screen, answers = ACTIONS[index % len(ACTIONS)]
+        cli.current_user_id = user_ids[(index // len(ACTIONS)) % len(user_ids)]
+        with scripted(answers):
+            if shared is not None:
+                # The old global current_user kept the user instance (and
+                # whatever it had loaded) alive in the shared session.
+                current_user = shared.get(User, cli.current_user_id)
+                screen(shared)
+            else:
+                with session_scope() as session:
+                    screen(session)
+        if on_action:
+            on_action(index - start + 1, shared)
+    return shared
+
+
+def run_mode(mode, args):
+
+    path = database_path(args.data_dir, args.size, args.users, args.seed)
+    engine = build_database(path, args.size, args.users, args.exercises_per_workout, args.seed)
+    sessionLocal.configure(bind=engine)
+
+    with session_scope() as session:
+        user_ids = session.scalars(select(User.id).order_by(User.id)).all()
+
+    warm_up = len(ACTIONS) * len(user_ids)
+    shared = run_actions(mode, user_ids, warm_up)
+    if shared is not None:
+        shared.close()
+
+    samples = []
+
+    def sample(done, session):
+
+        if done % args.sample_every == 0:
+            identity_map = len(session.identity_map) if session is not None else 0
+            samples.append({'actions': done, 'rss_kb': rss_kb(), 'identity_map': identity_map})
+
+    baseline = rss_kb()
+    start = time.perf_counter()
+    shared = run_actions(mode, user_ids, args.actions, start=warm_up, on_action=sample)
+    elapsed = time.perf_counter() - start
+    if shared is not None:
+        shared.close()
+
+    return {
+        'mode': mode,
+        'actions': args.actions,
+        'seconds': elapsed,
+        'baseline_kb': baseline,
+        'final_kb': samples[-1]['rss_kb'] if samples else baseline,
+        'peak_kb': max([baseline] + [s['rss_kb'] for s in samples]),
+        'samples': samples,
+    }
+
+
+def spawn_mode(mode, argv):
+
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.session_memory', '--mode', mode] + argv,
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{mode} run failed: {result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="RSS over a long CLI session, shared vs per-action sessions")
+    parser.add_argument('--actions', type=int, default=5000)
+    parser.add_argument('--sample-every', type=int, default=500)
+    parser.add_argument('--size', type=int, default=100000, help="total workout rows in the database")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--exercises-per-workout', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'))
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args)))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    # Build the database up front so neither mode pays for generation.
+    build_database(
+        database_path(args.data_dir, args.size, args.users, args.seed),
+        args.size, args.users, args.exercises_per_workout, args.seed
+    ).dispose()
+
+    child_argv = argv if argv is not None else sys.argv[1:]
+    results = [spawn_mode(mode, child_argv) for mode in MODES]
+
+    print(f"{args.actions:,} menu actions, {args.size:,} workouts, {args.users} users")
+    print(f"  {'Actions':>8} " + " ".join(f"{mode + ' RSS MiB':>16}" for mode in MODES) + f" {'shared map':>11}")
+    for row in zip(*[result['samples'] for result in results]):
+        print(
+            f"  {row[0]['actions']:>8} "
+            + " ".join(f"{sample['rss_kb'] / 1024:>16.1f}" for sample in row)
+            + f" {row[0]['identity_map']:>11,}"
+        )
+    for result in results:
+        print(
+            f"  {result['mode']:<7} {result['baseline_kb'] / 1024:.1f} -> {result['final_kb'] / 1024:.1f} MiB"
+            f" (peak {result['peak_kb'] / 1024:.1f}) in {result['seconds']:.1f}s"
+        )
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
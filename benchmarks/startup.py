@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Startup cost of the CLI entry points: `-X importtime` totals for the
+# modules each entry point loads, plus median wall time of whole commands.
+#
+#   python -m benchmarks.startup --runs 10 --json startup.json
+#
+# Runs against FITNESS_TRACKER_DATABASE_URL when it is set.
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TARGETS = ('lib.cli', 'lib.commands', 'lib.database', 'lib.models', 'lib.seed')
+
+COMMANDS = {
+    'help': ['-m', 'lib.cli', '--help'],
+    'stats_all_users': ['-m', 'lib.cli', 'stats'],
+    'search': ['-m', 'lib.cli', 'search', 'bench'],
+    'menu_open_and_exit': ['-m', 'lib.cli'],
+}
+
+MENU_INPUT = "0\n"
+
+# Run once before timing: migrates a new or old database and fills an empty
+# exercise library, so the menu doesn't stop to offer seeding and the
+# timed runs don't include a one-off migration.
+PREPARE = (
+    "from lib.database import init_db, session_scope\n"
+    "from lib.seed import seed_exercises\n"
+    "init_db()\n"
+    "with session_scope() as session: seed_exercises(session)\n"
+)
+
+
+def run_python(args, stdin=None):
+
+    return subprocess.run(
+        [sys.executable] + args,
+        cwd=PROJECT_ROOT,
+        input=stdin,
+        capture_output=True,
+        text=True
+    )
+
+
+def import_profile(module):
+    # Returns (cumulative us for the module, [(cumulative us, name)] slowest first).
+
+    result = run_python(['-X', 'importtime', '-c', f'import {module}'])
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        entries.append((int(cumulative_us), name.strip()))
+
+    total = next((us for us, name in entries if name == module), 0)
+    entries.sort(reverse=True)
+    return total, entries[:10]
+
+
+def time_command(args, runs):
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run_python(args, stdin=MENU_INPUT if args == COMMANDS['menu_open_and_exit'] else None)
+        timings.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} failed: {result.stderr.strip()}")
+    return statistics.median(timings)
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    report = {'imports': {}, 'commands': {}}
+
+    print("Import time (-X importtime, cumulative):")
+    for module in IMPORT_TARGETS:
+        total_us, slowest = import_profile(module)
+        report['imports'][module] = {
+            'total_ms': total_us / 1000,
+            'slowest': [{'module': name, 'cumulative_ms': us / 1000} for us, name in slowest],
+        }
+        print(f"  {module:<14} {report['imports'][module]['total_ms']:>8.1f} ms")
+
+    prepared = run_python(['-c', PREPARE])
+    if prepared.returncode != 0:
+        raise RuntimeError(f"preparing the database failed: {prepared.stderr.strip()}")
+
+    print("\nCommand wall time (median):")
+    for name, command in COMMANDS.items():
+        report['commands'][name] = time_command(command, args.runs)
+        print(f"  {name:<20} {report['commands'][name]:>8.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,506 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, update, func, distinct, case, literal, union_all, bindparam
+from sqlalchemy.dialects.sqlite import insert
+from lib.models import Workout, WorkoutExercise, Exercise, ExerciseUsage, UserStats, PersonalRecord, TrainingRollup
+from lib.helpers import calculate_one_rep_max
+
+# Denormalized summaries kept in step with the raw workout tables.
+# apply_workout is called inside the transaction that logs a workout, so the
+# summaries commit (or roll back) together with it. The rebuild_* functions
+# recompute everything from raw rows, for bulk loads and repairs.
+
+
+def workout_entries(workout_exercises):
+
+    return [(we.exercise_id, we.sets, we.reps, we.weight) for we in workout_exercises]
+
+
+def summarize_user_stats(workouts, now):
+
+    totals = {}
+    for user_id, workout_date, entries in workouts:
+        row = totals.get(user_id)
+        if row is None:
+            totals[user_id] = row = {
+                'user_id': user_id,
+                'workout_count': 0,
+                'exercise_count': 0,
+                'total_volume': 0.0,
+                'first_workout_date': workout_date,
+                'last_workout_date': workout_date,
+                'updated_at': now,
+            }
+        row['workout_count'] += 1
+        row['exercise_count'] += len(entries)
+        row['total_volume'] += sum(sets * reps * weight for _, sets, reps, weight in entries)
+        row['first_workout_date'] = min(row['first_workout_date'], workout_date)
+        row['last_workout_date'] = max(row['last_workout_date'], workout_date)
+    return list(totals.values())
+
+
+def update_user_stats(session, rows):
+
+    if not rows:
+        return
+
+    stats = UserStats.__table__
+    statement = insert(stats)
+    excluded = statement.excluded
+
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[stats.c.user_id],
+        set_={
+            'workout_count': stats.c.workout_count + excluded.workout_count,
+            'exercise_count': stats.c.exercise_count + excluded.exercise_count,
+            'total_volume': stats.c.total_volume + excluded.total_volume,
+            'first_workout_date': func.min(
+                func.coalesce(stats.c.first_workout_date, excluded.first_workout_date),
+                excluded.first_workout_date
+            ),
+            'last_workout_date': func.max(
+                func.coalesce(stats.c.last_workout_date, excluded.last_workout_date),
+                excluded.last_workout_date
+            ),
+            'updated_at': excluded.updated_at,
+        }
+    ), rows)
+
+
+def best_lifts(entries):
+
+    best = {}
+    for exercise_id, sets, reps, weight in entries:
+        record = best.get(exercise_id)
+        if record is None:
+            best[exercise_id] = record = {
+                'exercise_id': exercise_id,
+                'max_weight': weight,
+                'reps_at_max_weight': reps,
+                'max_set_volume': 0.0,
+                'estimated_one_rep_max': 0.0,
+            }
+        elif weight > record['max_weight']:
+            record['max_weight'] = weight
+            record['reps_at_max_weight'] = reps
+        elif weight == record['max_weight']:
+            record['reps_at_max_weight'] = max(record['reps_at_max_weight'], reps)
+
+        record['max_set_volume'] = max(record['max_set_volume'], reps * weight)
+        record['estimated_one_rep_max'] = max(
+            record['estimated_one_rep_max'], calculate_one_rep_max(weight, reps)
+        )
+    return list(best.values())
+
+
+def summarize_personal_records(workouts, now):
+
+    entries_by_user = {}
+    for user_id, _, entries in workouts:
+        entries_by_user.setdefault(user_id, []).extend(entries)
+
+    rows = []
+    for user_id, entries in entries_by_user.items():
+        for row in best_lifts(entries):
+            row.update(user_id=user_id, updated_at=now)
+            rows.append(row)
+    return rows
+
+
+def update_personal_records(session, rows):
+
+    if not rows:
+        return
+
+    records = PersonalRecord.__table__
+    statement = insert(records)
+    excluded = statement.excluded
+
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[records.c.user_id, records.c.exercise_id],
+        set_={
+            'max_weight': func.max(records.c.max_weight, excluded.max_weight),
+            'reps_at_max_weight': case(
+                (excluded.max_weight > records.c.max_weight, excluded.reps_at_max_weight),
+                (
+                    excluded.max_weight == records.c.max_weight,
+                    func.max(records.c.reps_at_max_weight, excluded.reps_at_max_weight)
+                ),
+                else_=records.c.reps_at_max_weight
+            ),
+            'max_set_volume': func.max(records.c.max_set_volume, excluded.max_set_volume),
+            'estimated_one_rep_max': func.max(
+                records.c.estimated_one_rep_max, excluded.estimated_one_rep_max
+            ),
+            'updated_at': excluded.updated_at,
+        }
+    ), rows)
+
+
+ROLLUP_PERIODS = ('day', 'week', 'month')
+
+SUMMARY_TABLES = (
+    UserStats.__tablename__, PersonalRecord.__tablename__,
+    TrainingRollup.__tablename__, ExerciseUsage.__tablename__
+)
+
+
+def period_start(period, day):
+
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def period_start_column(period, column):
+    # SQL counterpart of period_start for SQLite date columns.
+
+    if period == 'week':
+        return func.date(column, 'weekday 0', '-6 days')
+    if period == 'month':
+        return func.date(column, 'start of month')
+    return func.date(column)
+
+
+def summarize_rollups(session, workouts):
+
+    exercise_ids = {entry[0] for _, _, entries in workouts for entry in entries}
+    if not exercise_ids:
+        return []
+
+    muscle_groups = dict(session.execute(
+        select(Exercise.id, Exercise.muscle_group).where(Exercise.id.in_(exercise_ids))
+    ).all())
+
+    totals = {}
+    for user_id, workout_date, entries in workouts:
+        for exercise_id, sets, reps, weight in entries:
+            for period in ROLLUP_PERIODS:
+                key = (user_id, period, period_start(period, workout_date), muscle_groups[exercise_id])
+                row = totals.get(key)
+                if row is None:
+                    totals[key] = row = {
+                        'user_id': key[0],
+                        'period': key[1],
+                        'period_start': key[2],
+                        'muscle_group': key[3],
+                        'total_volume': 0.0,
+                        'total_sets': 0,
+                        'total_reps': 0,
+                        'exercise_count': 0,
+                    }
+                row['total_volume'] += sets * reps * weight
+                row['total_sets'] += sets
+                row['total_reps'] += sets * reps
+                row['exercise_count'] += 1
+    return list(totals.values())
+
+
+def update_rollups(session, rows):
+
+    if not rows:
+        return
+
+    rollups = TrainingRollup.__table__
+    statement = insert(rollups)
+    excluded = statement.excluded
+
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[rollups.c.user_id, rollups.c.period, rollups.c.period_start, rollups.c.muscle_group],
+        set_={
+            'total_volume': rollups.c.total_volume + excluded.total_volume,
+            'total_sets': rollups.c.total_sets + excluded.total_sets,
+            'total_reps': rollups.c.total_reps + excluded.total_reps,
+            'exercise_count': rollups.c.exercise_count + excluded.exercise_count,
+        }
+    ), rows)
+
+
+def summarize_usage(workouts):
+    # Per-user rows for exercise_usage and per-exercise totals for
+    # Exercise.usage_count.
+
+    usage = {}
+    for user_id, _, entries in workouts:
+        for exercise_id, _, _, _ in entries:
+            key = (user_id, exercise_id)
+            usage[key] = usage.get(key, 0) + 1
+
+    totals = {}
+    for (_, exercise_id), count in usage.items():
+        totals[exercise_id] = totals.get(exercise_id, 0) + count
+
+    rows = [
+        {'user_id': user_id, 'exercise_id': exercise_id, 'usage_count': count}
+        for (user_id, exercise_id), count in usage.items()
+    ]
+    return rows, [{'exercise': exercise_id, 'logged': count} for exercise_id, count in totals.items()]
+
+
+def update_usage_counts(session, rows, totals):
+
+    if not rows:
+        return
+
+    usage = ExerciseUsage.__table__
+    statement = insert(usage)
+
+    session.execute(statement.on_conflict_do_update(
+        index_elements=[usage.c.user_id, usage.c.exercise_id],
+        set_={'usage_count': usage.c.usage_count + statement.excluded.usage_count}
+    ), rows)
+
+    exercises = Exercise.__table__
+    session.execute(
+        update(exercises)
+        .where(exercises.c.id == bindparam('exercise'))
+        .values(usage_count=exercises.c.usage_count + bindparam('logged')),
+        totals
+    )
+
+
+def retract_usage_counts(session, rows, totals):
+    # Takes back what update_usage_counts added for the same rows and totals.
+
+    if not rows:
+        return
+
+    usage = ExerciseUsage.__table__
+    session.execute(
+        update(usage)
+        .where(usage.c.user_id == bindparam('user'), usage.c.exercise_id == bindparam('exercise'))
+        .values(usage_count=usage.c.usage_count - bindparam('logged')),
+        [
+            {'user': row['user_id'], 'exercise': row['exercise_id'], 'logged': row['usage_count']}
+            for row in rows
+        ]
+    )
+    session.execute(delete(usage).where(
+        usage.c.user_id.in_({row['user_id'] for row in rows}),
+        usage.c.usage_count <= 0
+    ))
+
+    exercises = Exercise.__table__
+    session.execute(
+        update(exercises)
+        .where(exercises.c.id == bindparam('exercise'))
+        .values(usage_count=exercises.c.usage_count - bindparam('logged')),
+        totals
+    )
+
+
+def apply_workouts(session, workouts):
+    # workouts: (user_id, workout_date, entries) per workout, where entries are
+    # (exercise_id, sets, reps, weight) tuples. Deltas are combined per user
+    # first, so a batch of any size costs one upsert executemany per table.
+
+    workouts = [(user_id, workout_date, list(entries)) for user_id, workout_date, entries in workouts]
+    now = datetime.now()
+
+    update_user_stats(session, summarize_user_stats(workouts, now))
+    update_personal_records(session, summarize_personal_records(workouts, now))
+    update_rollups(session, summarize_rollups(session, workouts))
+    update_usage_counts(session, *summarize_usage(workouts))
+
+
+def apply_workout(session, user_id, workout_date, entries):
+
+    apply_workouts(session, [(user_id, workout_date, entries)])
+
+
+def retract_workouts(session, workouts):
+    # Counterpart of apply_workouts for workouts that have been deleted (and
+    # flushed). Usage counts are decremented; totals, records and rollups
+    # can't all be (the deleted set may have been the record), so they are
+    # rebuilt for the users involved.
+
+    workouts = [(user_id, workout_date, list(entries)) for user_id, workout_date, entries in workouts]
+    user_ids = sorted({user_id for user_id, _, _ in workouts})
+
+    retract_usage_counts(session, *summarize_usage(workouts))
+    rebuild_user_stats(session, user_ids)
+    rebuild_personal_records(session, user_ids)
+    rebuild_rollups(session, user_ids)
+
+
+def rebuild_user_stats(session, user_ids=None):
+
+    clear = delete(UserStats)
+    if user_ids is not None:
+        clear = clear.where(UserStats.user_id.in_(user_ids))
+    session.execute(clear)
+
+    totals = (
+        select(
+            Workout.user_id,
+            func.count(distinct(Workout.id)),
+            func.count(WorkoutExercise.id),
+            func.coalesce(func.sum(WorkoutExercise.sets * WorkoutExercise.reps * WorkoutExercise.weight), 0.0),
+            func.min(Workout.workout_date),
+            func.max(Workout.workout_date),
+            func.current_timestamp()
+        )
+        .outerjoin(WorkoutExercise, WorkoutExercise.workout_id == Workout.id)
+        .group_by(Workout.user_id)
+    )
+    if user_ids is not None:
+        totals = totals.where(Workout.user_id.in_(user_ids))
+
+    session.execute(insert(UserStats).from_select(
+        ['user_id', 'workout_count', 'exercise_count', 'total_volume',
+         'first_workout_date', 'last_workout_date', 'updated_at'],
+        totals
+    ))
+
+
+def rebuild_personal_records(session, user_ids=None):
+
+    clear = delete(PersonalRecord)
+    if user_ids is not None:
+        clear = clear.where(PersonalRecord.user_id.in_(user_ids))
+    session.execute(clear)
+
+    partition = (Workout.user_id, WorkoutExercise.exercise_id)
+    one_rep_max = case(
+        (WorkoutExercise.reps <= 1, WorkoutExercise.weight),
+        else_=WorkoutExercise.weight * (1 + WorkoutExercise.reps / 30.0)
+    )
+
+    ranked = (
+        select(
+            Workout.user_id,
+            WorkoutExercise.exercise_id,
+            WorkoutExercise.weight,
+            WorkoutExercise.reps,
+            func.max(WorkoutExercise.reps * WorkoutExercise.weight).over(partition_by=partition).label('max_set_volume'),
+            func.max(one_rep_max).over(partition_by=partition).label('estimated_one_rep_max'),
+            func.row_number().over(
+                partition_by=partition,
+                order_by=(WorkoutExercise.weight.desc(), WorkoutExercise.reps.desc())
+            ).label('position')
+        )
+        .join(Workout, WorkoutExercise.workout_id == Workout.id)
+    )
+    if user_ids is not None:
+        ranked = ranked.where(Workout.user_id.in_(user_ids))
+    ranked = ranked.subquery()
+
+    session.execute(insert(PersonalRecord).from_select(
+        ['user_id', 'exercise_id', 'max_weight', 'reps_at_max_weight',
+         'max_set_volume', 'estimated_one_rep_max', 'updated_at'],
+        select(
+            ranked.c.user_id,
+            ranked.c.exercise_id,
+            ranked.c.weight,
+            ranked.c.reps,
+            ranked.c.max_set_volume,
+            ranked.c.estimated_one_rep_max,
+            func.current_timestamp()
+        ).where(ranked.c.position == 1)
+    ))
+
+
+def rebuild_rollups(session, user_ids=None):
+
+    clear = delete(TrainingRollup)
+    if user_ids is not None:
+        clear = clear.where(TrainingRollup.user_id.in_(user_ids))
+    session.execute(clear)
+
+    selects = []
+    for period in ROLLUP_PERIODS:
+        start = period_start_column(period, Workout.workout_date)
+        totals = (
+            select(
+                Workout.user_id,
+                literal(period),
+                start,
+                Exercise.muscle_group,
+                func.sum(WorkoutExercise.sets * WorkoutExercise.reps * WorkoutExercise.weight),
+                func.sum(WorkoutExercise.sets),
+                func.sum(WorkoutExercise.sets * WorkoutExercise.reps),
+                func.count(WorkoutExercise.id)
+            )
+            .join(Workout, WorkoutExercise.workout_id == Workout.id)
+            .join(Exercise, WorkoutExercise.exercise_id == Exercise.id)
+            .group_by(Workout.user_id, start, Exercise.muscle_group)
+        )
+        if user_ids is not None:
+            totals = totals.where(Workout.user_id.in_(user_ids))
+        selects.append(totals)
+
+    session.execute(insert(TrainingRollup).from_select(
+        ['user_id', 'period', 'period_start', 'muscle_group',
+         'total_volume', 'total_sets', 'total_reps', 'exercise_count'],
+        union_all(*selects)
+    ))
+
+
+def rebuild_usage_counts(session, user_ids=None):
+
+    used = select(ExerciseUsage.exercise_id).distinct()
+    touched = None
+    if user_ids is not None:
+        used = used.where(ExerciseUsage.user_id.in_(user_ids))
+        touched = set(session.scalars(used))
+
+    clear = delete(ExerciseUsage)
+    if user_ids is not None:
+        clear = clear.where(ExerciseUsage.user_id.in_(user_ids))
+    session.execute(clear)
+
+    counts = (
+        select(Workout.user_id, WorkoutExercise.exercise_id, func.count(WorkoutExercise.id))
+        .join(Workout, WorkoutExercise.workout_id == Workout.id)
+        .group_by(Workout.user_id, WorkoutExercise.exercise_id)
+    )
+    if user_ids is not None:
+        counts = counts.where(Workout.user_id.in_(user_ids))
+
+    session.execute(insert(ExerciseUsage).from_select(['user_id', 'exercise_id', 'usage_count'], counts))
+
+    # Global counts are the sum of the per-user rows. Rebuilding some users
+    # only changes the exercises they used before or use now.
+    exercises = Exercise.__table__
+    statement = update(exercises).values(usage_count=(
+        select(func.coalesce(func.sum(ExerciseUsage.usage_count), 0))
+        .where(ExerciseUsage.exercise_id == exercises.c.id)
+        .scalar_subquery()
+    ))
+    if touched is not None:
+        touched.update(session.scalars(used))
+        if not touched:
+            return
+        statement = statement.where(exercises.c.id.in_(touched))
+    session.execute(statement)
+
+
+def rebuild_all(session, user_ids=None):
+
+    rebuild_user_stats(session, user_ids)
+    rebuild_personal_records(session, user_ids)
+    rebuild_rollups(session, user_ids)
+    rebuild_usage_counts(session, user_ids)
+
+
+if __name__ == "__main__":
+
+    from lib.database import init_db, get_session
+
+    init_db()
+    session = get_session()
+
+    try:
+        print("Rebuilding summary tables from workout history...")
+        rebuild_all(session)
+        session.commit()
+        print(f" Rebuilt stats for {session.query(UserStats).count()} users")
+        print(f" Rebuilt {session.query(PersonalRecord).count()} personal records")
+        print(f" Rebuilt {session.query(TrainingRollup).count()} training rollups")
+        print(f" Rebuilt {session.query(ExerciseUsage).count()} exercise usage counts")
+    except Exception as e:
+        print(f"Error during rebuild: {e}")
+        session.rollback()
+    finally:
+        session.close()
@@ -0,0 +1,229 @@
+from dataclasses import dataclass, field
+from datetime import date
+from sqlalchemy import select, func
+from lib.models import Workout, WorkoutExercise, Exercise
+from lib.helpers import calculate_one_rep_max
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Heavier analytics over a user's logged sets: estimated 1RM curves,
+# moving averages, volume per muscle group and per day. The sets are read
+# once as plain columns (no ORM objects) and every figure is computed from
+# those columns. With NumPy installed the computations are vectorized;
+# otherwise the same results come from pure-Python loops.
+#
+#   pip install numpy
+
+HAS_NUMPY = np is not None
+
+# julianday() of 0001-01-01, so julianday - offset gives date.toordinal().
+JULIAN_DAY_OFFSET = 1721424.5
+
+
+def set_columns_query(user_id):
+
+    return (
+        select(
+            func.julianday(Workout.workout_date) - JULIAN_DAY_OFFSET,
+            WorkoutExercise.exercise_id,
+            WorkoutExercise.sets,
+            WorkoutExercise.reps,
+            WorkoutExercise.weight
+        )
+        .join(Workout, WorkoutExercise.workout_id == Workout.id)
+        .where(Workout.user_id == user_id)
+    )
+
+
+class PythonBackend:
+
+    name = 'python'
+
+    def columns(self, rows):
+
+        days, exercise_ids, sets, reps, weights = (list(column) for column in zip(*rows)) if rows else ([],) * 5
+        return {
+            'day': [int(day) for day in days],
+            'exercise_id': exercise_ids,
+            'sets': sets,
+            'reps': reps,
+            'weight': weights,
+        }
+
+    def volume_by_muscle_group(self, columns, muscle_groups):
+
+        totals = {}
+        for exercise_id, sets, reps, weight in zip(
+            columns['exercise_id'], columns['sets'], columns['reps'], columns['weight']
+        ):
+            group = muscle_groups[exercise_id]
+            totals[group] = totals.get(group, 0.0) + sets * reps * weight
+        return totals
+
+    def exercise_frequency(self, columns):
+
+        counts = {}
+        for exercise_id in columns['exercise_id']:
+            counts[exercise_id] = counts.get(exercise_id, 0) + 1
+        return counts
+
+    def daily_volume(self, columns):
+
+        totals = {}
+        for day, sets, reps, weight in zip(columns['day'], columns['sets'], columns['reps'], columns['weight']):
+            totals[day] = totals.get(day, 0.0) + sets * reps * weight
+        return sorted(totals.items())
+
+    def one_rep_max_curve(self, columns, exercise_id):
+
+        best = {}
+        for day, entry_id, reps, weight in zip(
+            columns['day'], columns['exercise_id'], columns['reps'], columns['weight']
+        ):
+            if entry_id != exercise_id:
+                continue
+            estimate = calculate_one_rep_max(weight, reps)
+            if estimate > best.get(day, -1.0):
+                best[day] = estimate
+        return sorted(best.items())
+
+    def moving_average(self, values, window):
+
+        averages = []
+        running = 0.0
+        for index, value in enumerate(values):
+            running += value
+            if index >= window:
+                running -= values[index - window]
+            if index >= window - 1:
+                averages.append(running / window)
+        return averages
+
+
+class NumpyBackend:
+
+    name = 'numpy'
+
+    def columns(self, rows):
+
+        # Plain tuples convert in C; numpy falls back to slow per-item
+        # access on SQLAlchemy Row objects.
+        table = np.array([tuple(row) for row in rows], dtype=np.float64).reshape(-1, 5)
+        return {
+            'day': table[:, 0].astype(np.int64),
+            'exercise_id': table[:, 1].astype(np.int64),
+            'sets': table[:, 2],
+            'reps': table[:, 3],
+            'weight': table[:, 4],
+        }
+
+    def volume_by_muscle_group(self, columns, muscle_groups):
+
+        groups = sorted(set(muscle_groups.values()))
+        codes = np.zeros(max(muscle_groups, default=0) + 1, dtype=np.int64)
+        for exercise_id, group in muscle_groups.items():
+            codes[exercise_id] = groups.index(group)
+
+        used = codes[columns['exercise_id']]
+        volume = columns['sets'] * columns['reps'] * columns['weight']
+        totals = np.bincount(used, weights=volume, minlength=len(groups))
+        present = np.bincount(used, minlength=len(groups)) > 0
+        return {groups[code]: float(totals[code]) for code in np.flatnonzero(present)}
+
+    def exercise_frequency(self, columns):
+
+        exercise_ids, counts = np.unique(columns['exercise_id'], return_counts=True)
+        return dict(zip(exercise_ids.tolist(), counts.tolist()))
+
+    def daily_volume(self, columns):
+
+        days, positions = np.unique(columns['day'], return_inverse=True)
+        totals = np.bincount(positions, weights=columns['sets'] * columns['reps'] * columns['weight'])
+        return list(zip(days.tolist(), totals.tolist()))
+
+    def one_rep_max_curve(self, columns, exercise_id):
+
+        mask = columns['exercise_id'] == exercise_id
+        reps = columns['reps'][mask]
+        weight = columns['weight'][mask]
+        # Vectorized lib.helpers.calculate_one_rep_max (Epley); keep the two in step.
+        estimates = np.where(reps <= 1, weight, weight * (1 + reps / 30))
+
+        days, positions = np.unique(columns['day'][mask], return_inverse=True)
+        best = np.full(len(days), -1.0)
+        np.maximum.at(best, positions, estimates)
+        return list(zip(days.tolist(), best.tolist()))
+
+    def moving_average(self, values, window):
+
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) < window:
+            return []
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        return ((sums[window:] - sums[:-window]) / window).tolist()
+
+
+BACKENDS = {'python': PythonBackend}
+if HAS_NUMPY:
+    BACKENDS['numpy'] = NumpyBackend
+
+
+def get_backend(name=None):
+
+    if name is None:
+        name = 'numpy' if HAS_NUMPY else 'python'
+    if name == 'numpy' and not HAS_NUMPY:
+        raise RuntimeError("The numpy backend needs NumPy (pip install numpy)")
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown analytics backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]()
+
+
+@dataclass
+class UserAnalytics:
+
+    backend: str
+    set_count: int = 0
+    volume_by_muscle_group: dict = field(default_factory=dict)
+    exercise_frequency: dict = field(default_factory=dict)
+    daily_volume: list = field(default_factory=list)
+    volume_moving_average: list = field(default_factory=list)
+    one_rep_max_curve: list = field(default_factory=list)
+    one_rep_max_moving_average: list = field(default_factory=list)
+
+
+def load_set_columns(session, user_id, backend=None):
+
+    backend = backend or get_backend()
+    return backend.columns(session.execute(set_columns_query(user_id)).all())
+
+
+def get_user_analytics(session, user_id, exercise_id=None, window=4, backend=None):
+    # Dates in the returned series are datetime.date; moving averages are
+    # over the last `window` training days.
+
+    backend = get_backend(backend)
+    columns = load_set_columns(session, user_id, backend)
+    muscle_groups = dict(session.execute(select(Exercise.id, Exercise.muscle_group)).all())
+
+    daily = backend.daily_volume(columns)
+    analytics = UserAnalytics(
+        backend=backend.name,
+        set_count=len(columns['day']),
+        volume_by_muscle_group=backend.volume_by_muscle_group(columns, muscle_groups),
+        exercise_frequency=backend.exercise_frequency(columns),
+        daily_volume=[(date.fromordinal(day), volume) for day, volume in daily],
+        volume_moving_average=backend.moving_average([volume for _, volume in daily], window)
+    )
+
+    if exercise_id is not None:
+        curve = backend.one_rep_max_curve(columns, exercise_id)
+        analytics.one_rep_max_curve = [(date.fromordinal(day), estimate) for day, estimate in curve]
+        analytics.one_rep_max_moving_average = backend.moving_average(
+            [estimate for _, estimate in curve], window
+        )
+
+    return analytics
@@ -0,0 +1,273 @@
+import argparse
+import asyncio
+import json
+import re
+import sys
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from lib import services
+from lib.database import DATABASE_URL, SQLITE_PROFILE, create_tuned_async_engine
+
+# JSON over HTTP for kiosks and the mobile app:
+#
+#   python -m lib.api --port 8080
+#
+#   GET  /health
+#   GET  /users                        POST /users
+#   GET  /users/{id}
+#   GET  /users/{id}/stats?top=5
+#   GET  /users/{id}/workouts?limit=10&after=CURSOR
+#   POST /users/{id}/workouts
+#   DELETE /users/{id}/workouts/{workout_id}
+#   GET  /exercises?q=bench&muscle_group=Chest&sort=popular&user=1&limit=10
+#
+# One asyncio event loop serves every connection (HTTP/1.1 keep-alive);
+# database work goes through SQLAlchemy's async engine (aiosqlite), and each
+# request runs the lib.services function it maps to with
+# AsyncSession.run_sync, so the API and the CLI share the same code.
+
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class HTTPError(Exception):
+
+    def __init__(self, status, message=None):
+
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class Request:
+
+    def __init__(self, method, target, headers, body):
+
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path.rstrip('/') or '/'
+        self.query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+
+        try:
+            payload = json.loads(self.body or b'{}')
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        return payload
+
+    def int_param(self, name, default):
+
+        value = self.query.get(name)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"'{name}' must be a whole number")
+
+
+class TrackerAPI:
+
+    def __init__(self, engine):
+
+        self.engine = engine
+        self.sessions = async_sessionmaker(engine, expire_on_commit=False)
+        self.routes = [
+            ('GET', r'/health', self.health),
+            ('GET', r'/users', self.list_users),
+            ('POST', r'/users', self.create_user),
+            ('GET', r'/users/(?P<user_id>\d+)', self.get_user),
+            ('GET', r'/users/(?P<user_id>\d+)/stats', self.get_statistics),
+            ('GET', r'/users/(?P<user_id>\d+)/workouts', self.get_workouts),
+            ('POST', r'/users/(?P<user_id>\d+)/workouts', self.log_workout),
+            ('DELETE', r'/users/(?P<user_id>\d+)/workouts/(?P<workout_id>\d+)', self.delete_workout),
+            ('GET', r'/exercises', self.search_exercises),
+        ]
+        self.routes = [(method, re.compile(pattern + '$'), handler) for method, pattern, handler in self.routes]
+
+    async def call(self, function, *args, **kwargs):
+        # Runs a sync service function on a fresh session from the async engine.
+
+        async with self.sessions() as session:
+            return await session.run_sync(function, *args, **kwargs)
+
+    async def health(self, request):
+
+        return HTTPStatus.OK, {'status': 'ok'}
+
+    async def list_users(self, request):
+
+        return HTTPStatus.OK, await self.call(services.list_users)
+
+    async def create_user(self, request):
+
+        payload = request.json()
+        return HTTPStatus.CREATED, await self.call(
+            services.create_user,
+            payload.get('name'),
+            age=payload.get('age'),
+            weight=payload.get('weight'),
+            fitness_goal=payload.get('fitness_goal')
+        )
+
+    async def get_user(self, request, user_id):
+
+        return HTTPStatus.OK, await self.call(services.get_user, int(user_id))
+
+    async def get_statistics(self, request, user_id):
+
+        return HTTPStatus.OK, await self.call(
+            services.get_statistics, int(user_id), top_n=request.int_param('top', 5)
+        )
+
+    async def get_workouts(self, request, user_id):
+
+        return HTTPStatus.OK, await self.call(
+            services.get_workout_history, int(user_id),
+            limit=request.int_param('limit', services.HISTORY_PAGE_SIZE),
+            after=request.query.get('after')
+        )
+
+    async def log_workout(self, request, user_id):
+
+        payload = request.json()
+        exercises = payload.get('exercises')
+        if not isinstance(exercises, list) or not all(isinstance(entry, dict) for entry in exercises):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'exercises' must be a list of objects")
+
+        return HTTPStatus.CREATED, await self.call(
+            services.log_workout, int(user_id), exercises,
+            workout_date=payload.get('date'),
+            notes=payload.get('notes'),
+            duration=payload.get('duration')
+        )
+
+    async def delete_workout(self, request, user_id, workout_id):
+
+        return HTTPStatus.OK, await self.call(services.delete_workout, int(user_id), int(workout_id))
+
+    async def search_exercises(self, request):
+
+        sort = request.query.get('sort')
+        if sort not in (None, 'popular'):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'sort' must be 'popular'")
+
+        return HTTPStatus.OK, await self.call(
+            services.search_exercises, request.query.get('q'), request.query.get('muscle_group'),
+            popular=sort == 'popular',
+            user_id=request.int_param('user', None),
+            limit=request.int_param('limit', None)
+        )
+
+    async def dispatch(self, request):
+
+        allowed = []
+        for method, pattern, handler in self.routes:
+            match = pattern.match(request.path)
+            if match is None:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+
+            try:
+                return await handler(request, **match.groupdict())
+            except HTTPError as e:
+                return e.status, {'error': str(e)}
+            except services.NotFound as e:
+                return HTTPStatus.NOT_FOUND, {'error': str(e)}
+            except services.ServiceError as e:
+                return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+            except Exception as e:
+                print(f"Error handling {request.method} {request.path}: {e!r}", file=sys.stderr)
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Internal server error"}
+
+        if allowed:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"Use {' or '.join(allowed)}"}
+        return HTTPStatus.NOT_FOUND, {'error': f"No route for {request.path}"}
+
+    async def handle_connection(self, reader, writer):
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self.respond(writer, HTTPStatus.BAD_REQUEST, {'error': "Malformed request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY_SIZE:
+                    await self.respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "Body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.dispatch(Request(method.upper(), target, headers, body))
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+
+        body = json.dumps(payload, default=str).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+
+
+async def serve(host='127.0.0.1', port=8080, url=DATABASE_URL, profile=SQLITE_PROFILE, pool_size=5):
+
+    engine = create_tuned_async_engine(url, profile=profile, pool_size=pool_size)
+    api = TrackerAPI(engine)
+    server = await asyncio.start_server(api.handle_connection, host, port)
+
+    print(f"Serving the fitness tracker API on http://{host}:{port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Fitness tracker HTTP/JSON API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--pool-size', type=int, default=5, help="database connections kept open")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, pool_size=args.pool_size))
+    except KeyboardInterrupt:
+        pass
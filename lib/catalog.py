@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from sqlalchemy import select
+from lib.models import Exercise
+from lib.search import search_index_available, build_match_query, apply_search
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+
+    id: int
+    name: str
+    muscle_group: str
+    equipment_needed: str = None
+    description: str = None
+    is_custom: bool = False
+
+    @classmethod
+    def from_exercise(cls, exercise):
+
+        return cls(
+            id=exercise.id,
+            name=exercise.name,
+            muscle_group=exercise.muscle_group,
+            equipment_needed=exercise.equipment_needed,
+            description=exercise.description,
+            is_custom=bool(exercise.is_custom)
+        )
+
+
+class ExerciseCatalog:
+    # Process-level copy of the exercise library. The library only changes
+    # through add_custom_exercise and seeding, so lookups and browsing are
+    # served from these indexes and the database is only hit to load it.
+
+    def __init__(self):
+
+        self.invalidate()
+
+    def invalidate(self):
+
+        self.loaded = False
+        self.by_id = {}
+        self.by_name = {}
+        self.by_muscle_group = {}
+
+    def load(self, session):
+
+        self.invalidate()
+        for exercise in session.scalars(select(Exercise).order_by(Exercise.id)):
+            self.add(exercise)
+        self.loaded = True
+
+    def ensure_loaded(self, session):
+
+        if not self.loaded:
+            self.load(session)
+
+    def add(self, exercise):
+
+        entry = CatalogEntry.from_exercise(exercise)
+        self.by_id[entry.id] = entry
+        self.by_name[entry.name.lower()] = entry
+        self.by_muscle_group.setdefault(entry.muscle_group, []).append(entry)
+        return entry
+
+    def __len__(self):
+
+        return len(self.by_id)
+
+    def get(self, exercise_id):
+
+        return self.by_id.get(exercise_id)
+
+    def find_by_name(self, name):
+
+        return self.by_name.get(name.strip().lower())
+
+    def filter_by_muscle_group(self, muscle_group):
+
+        return list(self.by_muscle_group.get(muscle_group, []))
+
+    def all_exercises(self):
+
+        return sorted(self.by_id.values(), key=lambda e: (e.muscle_group, e.name))
+
+    def search(self, session, search_term):
+
+        self.ensure_loaded(session)
+
+        if search_index_available(session) and build_match_query(search_term):
+            exercise_ids = session.scalars(
+                apply_search(select(Exercise.id), Exercise, search_term)
+            ).all()
+            entries = [self.by_id[i] for i in exercise_ids if i in self.by_id]
+            if entries:
+                return entries
+
+        term = search_term.strip().lower()
+        return [entry for name, entry in self.by_name.items() if term in name]
+
+
+catalog = ExerciseCatalog()
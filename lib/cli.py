@@ -1,19 +1,49 @@
 
 import sys
+
+# Scripted subcommands are dispatched before the interactive menu's imports
+# so `python -m lib.cli stats ...` only loads what that command needs.
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from lib.commands import main
+    sys.exit(main(sys.argv[1:]))
+
 import os
 from datetime import date
-from lib.database import init_db, get_session
-from lib.models import User, Exercise, Workout, WorkoutExercise
-from lib.seed import seed_database
+from lib.database import init_db, session_scope
+from sqlalchemy import select
+from lib.models import User, Exercise
+from lib.catalog import catalog
+from lib.statistics import (
+    get_user_statistics, get_user_summary, get_user_rows, get_personal_records, get_personal_record
+)
+from lib.workout_draft import WorkoutDraft
+from lib import services
+from lib.profiling import profiler
+from lib.history import HISTORY_PAGE_SIZE, get_workout_page, get_exercise_history, workout_cursor
+from lib.progression import PLATEAU_SESSIONS, PLATEAU_TOLERANCE, get_user_progressions, get_exercise_progression
+from lib.trends import get_volume_trend, get_muscle_group_breakdown, get_trained_muscle_groups
+from lib.leaderboards import (
+    leaderboard_cache, get_weekly_volume_leaderboard,
+    get_exercise_record_leaderboard, get_streak_leaderboard
+)
 from lib.helpers import (
     clear_screen, print_header, print_subheader,
     get_valid_integer, get_valid_float, get_valid_date,
-    format_workout_summary, display_exercise_list,
+    format_workout_summary, display_exercise_list, print_bar_chart,
     get_exercise_choice, confirm_action
 )
 
 
-current_user = None
+POPULAR_EXERCISES = 10
+
+# The active user is remembered by id; each screen loads it into its own
+# short-lived session (see session_scope) so nothing outlives the screen.
+current_user_id = None
+
+
+def get_current_user(session):
+
+    return session.get(User, current_user_id) if current_user_id else None
 
 
 def create_user(session):
@@ -34,26 +64,22 @@ def create_user(session):
     fitness_goal = input("  Enter your fitness goal (optional, press Enter to skip): ").strip()
     fitness_goal = fitness_goal if fitness_goal else None
     
-    new_user = User(
-        name=name,
-        age=age,
-        weight=weight,
-        fitness_goal=fitness_goal
-    )
-    
-    session.add(new_user)
-    session.commit()
+    try:
+        record = services.create_user(session, name, age=age, weight=weight, fitness_goal=fitness_goal)
+    except services.ServiceError as e:
+        print(f" {e}.")
+        return
     
-    print(f"\n User '{name}' created successfully! (ID: {new_user.id})")
+    print(f"\n User '{name}' created successfully! (ID: {record['id']})")
     
     
-    global current_user
-    current_user = new_user
+    global current_user_id
+    current_user_id = record['id']
     print(f" '{name}' is now the active user.")
 
 def list_users(session):
   
-    users = session.query(User).all()
+    users = get_user_rows(session)
     
     if not users:
         print("\n  No users found. Create a user first!")
@@ -69,7 +95,7 @@ def list_users(session):
             print(f"     Weight: {user.weight} lbs")
         if user.fitness_goal:
             print(f"     Goal: {user.fitness_goal}")
-        print(f"     Workouts: {user.get_workout_count()}")
+        print(f"     Workouts: {user.workout_count}")
         print()
     
     return users
@@ -93,16 +119,16 @@ def switch_user(session):
         print("  Cancelled.")
         return
     
-    global current_user
-    current_user = users[choice - 1]
-    print(f"\n Switched to user: {current_user.name}")
+    global current_user_id
+    current_user_id = users[choice - 1].id
+    print(f"\n Switched to user: {users[choice - 1].name}")
 
 def user_management_menu(session):
 
     while True:
         print_subheader("User Management")
         
-        
+        current_user = get_current_user(session)
         if current_user:
             print(f"\n  Current User: {current_user.name}")
         else:
@@ -130,6 +156,7 @@ def user_management_menu(session):
 
 def log_workout(session):
    
+    current_user = get_current_user(session)
     if not current_user:
         print("\n Please select or create a user first!")
         return
@@ -143,14 +170,13 @@ def log_workout(session):
     notes = notes if notes else None
     
 
-    workout = Workout(
-        user=current_user,  
+    workout = WorkoutDraft(
+        user_id=current_user.id,
         workout_date=workout_date,
         notes=notes
     )
-    session.add(workout)
     
-    print(f"\n Workout session created for {workout_date}")
+    print(f"\n Workout session started for {workout_date}")
     print("\n  Now let's add exercises to this workout...")
 
     while True:
@@ -159,12 +185,19 @@ def log_workout(session):
         print("-"*60)
         
     
-        search_term = input("\n  Search exercise by name (or 'cancel' to finish): ").strip()
+        search_term = input("\n  Search exercise by name ('done' to finish, 'cancel' to discard workout): ").strip()
         
-        if search_term.lower() == 'cancel':
+        if search_term.lower() == 'done':
             break
         
-        exercises = Exercise.search_by_name(session, search_term)
+        if search_term.lower() == 'cancel':
+            if confirm_action("Discard this workout? Nothing will be saved."):
+                workout.discard()
+                print("\n Workout discarded.")
+                return
+            continue
+        
+        exercises = catalog.search(session, search_term)
         
         if not exercises:
             print(f"\n  No exercises found matching '{search_term}'")
@@ -193,15 +226,7 @@ def log_workout(session):
         exercise_notes = input("  Notes (optional, press Enter to skip): ").strip()
         exercise_notes = exercise_notes if exercise_notes else None
     
-        workout_exercise = WorkoutExercise(
-            workout=workout,
-            exercise=exercise,
-            sets=sets,
-            reps=reps,
-            weight=weight,
-            notes=exercise_notes
-        )
-        session.add(workout_exercise)
+        workout.add_exercise(exercise, sets, reps, weight, notes=exercise_notes)
         
         print(f"\n Added: {exercise.name} - {sets}x{reps} @ {weight}lbs")
         
@@ -209,14 +234,14 @@ def log_workout(session):
         if not confirm_action("Add another exercise?"):
             break
     
-    session.commit()
+    workout_id = workout.save(session)
     
 
     print("\n" + "="*60)
     print("  WORKOUT SUMMARY")
     print("="*60)
     print(format_workout_summary(workout))
-    print(f"\n Workout logged successfully! (ID: {workout.id})")
+    print(f"\n Workout logged successfully! (ID: {workout_id})")
 
 def browse_exercises_by_muscle_group(session):
   
@@ -238,7 +263,8 @@ def browse_exercises_by_muscle_group(session):
     
     selected_muscle_group = muscle_groups[choice - 1]
     
-    exercises = Exercise.filter_by_muscle_group(session, selected_muscle_group)
+    catalog.ensure_loaded(session)
+    exercises = catalog.filter_by_muscle_group(selected_muscle_group)
     
     if not exercises:
         print(f"\n  No exercises found for {selected_muscle_group}")
@@ -250,6 +276,7 @@ def browse_exercises_by_muscle_group(session):
 
 def view_workout_history(session):
 
+    current_user = get_current_user(session)
     if not current_user:
         print("\n Please select or create a user first!")
         return
@@ -257,31 +284,66 @@ def view_workout_history(session):
     print_subheader(f"Workout History - {current_user.name}")
     
     
-    workouts = current_user.get_all_workouts()
+    total_workouts, total_exercises, _, _, _ = get_user_summary(session, current_user.id)
     
-    if not workouts:
+    if not total_workouts:
         print("\n  No workouts logged yet. Start logging workouts!")
         return
     
-
-    sorted_workouts = sorted(workouts, key=lambda w: w.workout_date, reverse=True)
+    total_pages = (total_workouts + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
     
-    print(f"\n  Total Workouts: {len(sorted_workouts)}")
-    print(f"  Total Exercises Logged: {current_user.get_total_exercises_logged()}")
+    print(f"\n  Total Workouts: {total_workouts}")
+    print(f"  Total Exercises Logged: {total_exercises}")
+
+    page_number = 1
+    workouts, has_next = get_workout_page(session, current_user.id)
+    has_previous = False
 
-    for idx, workout in enumerate(sorted_workouts, 1):
-        print("\n" + "="*60)
-        print(f"  WORKOUT {idx}")
-        print("="*60)
-        print(format_workout_summary(workout))
+    while True:
+        for idx, workout in enumerate(workouts, (page_number - 1) * HISTORY_PAGE_SIZE + 1):
+            print("\n" + "="*60)
+            print(f"  WORKOUT {idx}")
+            print("="*60)
+            print(format_workout_summary(workout))
+            
+            if workout.notes:
+                print(f"  Notes: {workout.notes}")
         
-        if workout.notes:
-            print(f"  Notes: {workout.notes}")
-    
-    input("\n  Press Enter to continue...")
+        print(f"\n  Page {page_number} of {total_pages}")
+        
+        if not has_next and not has_previous:
+            input("\n  Press Enter to continue...")
+            return
+        
+        options = []
+        if has_next:
+            options.append("n = next")
+        if has_previous:
+            options.append("p = previous")
+        options.append("q = back")
+        
+        choice = input(f"  ({', '.join(options)}): ").strip().lower()
+        
+        if choice == 'n' and has_next:
+            workouts, has_next = get_workout_page(
+                session, current_user.id, after=workout_cursor(workouts[-1])
+            )
+            has_previous = True
+            page_number += 1
+        elif choice == 'p' and has_previous:
+            workouts, has_previous = get_workout_page(
+                session, current_user.id, before=workout_cursor(workouts[0])
+            )
+            has_next = True
+            page_number -= 1
+        elif choice == 'q':
+            return
+        else:
+            print(" Invalid choice.")
 
 def view_exercise_history(session):
    
+    current_user = get_current_user(session)
     if not current_user:
         print("\n Please select or create a user first!")
         return
@@ -294,7 +356,7 @@ def view_exercise_history(session):
         print(" Search term cannot be empty.")
         return
 
-    exercises = Exercise.search_by_name(session, search_term)
+    exercises = catalog.search(session, search_term)
     
     if not exercises:
         print(f"\n  No exercises found matching '{search_term}'")
@@ -308,14 +370,7 @@ def view_exercise_history(session):
         return
     
 
-    workout_exercises = session.query(WorkoutExercise).join(
-        Workout
-    ).filter(
-        Workout.user_id == current_user.id,
-        WorkoutExercise.exercise_id == exercise.id
-    ).order_by(
-        Workout.workout_date.desc()
-    ).all()
+    workout_exercises = get_exercise_history(session, current_user.id, exercise.id)
     
     if not workout_exercises:
         print(f"\n  No history found for {exercise.name}")
@@ -327,13 +382,28 @@ def view_exercise_history(session):
     print(f"\n  Total Sessions: {len(workout_exercises)}")
     
 
-    max_weight = max([we.weight for we in workout_exercises])
-    print(f"  Personal Record: {max_weight} lbs")
+    record = get_personal_record(session, current_user.id, exercise.id)
+    if record:
+        print(f"  Personal Record: {record.max_weight} lbs x {record.reps_at_max_weight} reps")
+        print(f"  Estimated 1RM: {record.estimated_one_rep_max:.1f} lbs")
+    else:
+        max_weight = max([we.weight for we in workout_exercises])
+        print(f"  Personal Record: {max_weight} lbs")
+
+    progression = get_exercise_progression(session, current_user.id, exercise.id)
+    if progression:
+        latest = progression.latest
+        print(f"  Latest Session Est. 1RM: {latest.epley:.1f} lbs (Epley) / {latest.brzycki:.1f} lbs (Brzycki)")
+        print(f"  Trend: {progression.trend_per_week:+.1f} lbs/week overall, "
+              f"{progression.recent_trend_per_week:+.1f} lbs/week recently")
+        if progression.plateau:
+            print(f"  ! Plateau: best not up more than {PLATEAU_TOLERANCE:.0%} in {progression.stalled_sessions} sessions"
+                  f" (best {progression.best_estimate:.1f} lbs on {progression.best_date})")
     
     
     print("\n  Session History:")
     for idx, we in enumerate(workout_exercises, 1):
-        print(f"\n  {idx}. Date: {we.workout.workout_date}")
+        print(f"\n  {idx}. Date: {we.workout_date}")
         print(f"     {we.sets} sets × {we.reps} reps @ {we.weight} lbs")
         print(f"     Volume: {we.calculate_volume()} lbs")
         if we.notes:
@@ -343,66 +413,266 @@ def view_exercise_history(session):
 
 def view_statistics(session):
     
+    current_user = get_current_user(session)
     if not current_user:
         print("\n Please select or create a user first!")
         return
     
     print_subheader(f"Statistics - {current_user.name}")
     
-    workouts = current_user.get_all_workouts()
+    stats = get_user_statistics(session, current_user.id)
     
-    if not workouts:
+    if not stats.total_workouts:
         print("\n  No workout data available yet.")
         return
     
 
-    total_workouts = len(workouts)
-    total_exercises = current_user.get_total_exercises_logged()
-
-    total_volume = sum([workout.get_total_volume() for workout in workouts])
+    print("\n" + "="*60)
+    print("  OVERALL STATISTICS")
+    print("="*60)
+    print(f"\n  Total Workouts: {stats.total_workouts}")
+    print(f"  Total Exercises Logged: {stats.total_exercises}")
+    print(f"  Total Volume Lifted: {stats.total_volume:,.1f} lbs")
+    print(f"\n  First Workout: {stats.earliest_workout}")
+    print(f"  Latest Workout: {stats.latest_workout}")
+    print(f"  Days Active: {stats.days_active}")
+    print(f"  Workout Frequency: {stats.workouts_per_week:.1f} workouts/week")
     
-    workout_dates = [w.workout_date for w in workouts]
-    earliest_workout = min(workout_dates)
-    latest_workout = max(workout_dates)
+    print("\n  Most Frequently Trained Exercises:")
+    for idx, (exercise_name, count) in enumerate(stats.top_exercises, 1):
+        print(f"    {idx}. {exercise_name}: {count} sessions")
     
+    input("\n  Press Enter to continue...")
+
 
-    days_active = (latest_workout - earliest_workout).days + 1
-    weeks_active = days_active / 7
-    workouts_per_week = total_workouts / weeks_active if weeks_active > 0 else 0
-    
 
+def view_personal_records(session):
 
-    exercise_count = {}
-    for workout in workouts:
-        for we in workout.workout_exercises:
-            exercise_name = we.get_exercise_name()
-            exercise_count[exercise_name] = exercise_count.get(exercise_name, 0) + 1
+    current_user = get_current_user(session)
+    if not current_user:
+        print("\n Please select or create a user first!")
+        return
     
-   
-    sorted_exercises = sorted(
-        exercise_count.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )
+    print_subheader(f"Personal Records - {current_user.name}")
     
-
-    print("\n" + "="*60)
-    print("  OVERALL STATISTICS")
-    print("="*60)
-    print(f"\n  Total Workouts: {total_workouts}")
-    print(f"  Total Exercises Logged: {total_exercises}")
-    print(f"  Total Volume Lifted: {total_volume:,.1f} lbs")
-    print(f"\n  First Workout: {earliest_workout}")
-    print(f"  Latest Workout: {latest_workout}")
-    print(f"  Days Active: {days_active}")
-    print(f"  Workout Frequency: {workouts_per_week:.1f} workouts/week")
+    records = get_personal_records(session, current_user.id)
     
-    print("\n  Most Frequently Trained Exercises:")
-    for idx, (exercise_name, count) in enumerate(sorted_exercises[:5], 1):
-        print(f"    {idx}. {exercise_name}: {count} sessions")
+    if not records:
+        print("\n  No personal records yet. Log some workouts!")
+        return
+    
+    current_group = None
+    for record in records:
+        if record.muscle_group != current_group:
+            current_group = record.muscle_group
+            print(f"\n  === {current_group} ===")
+        print(f"     {record.name}")
+        print(
+            f"      Best: {record.max_weight} lbs x {record.reps_at_max_weight}"
+            f" | Best Set Volume: {record.max_set_volume:,.1f} lbs"
+            f" | Est. 1RM: {record.estimated_one_rep_max:.1f} lbs"
+        )
     
     input("\n  Press Enter to continue...")
 
+def view_progression_report(session):
+
+    current_user = get_current_user(session)
+    if not current_user:
+        print("\n Please select or create a user first!")
+        return
+
+    print_subheader(f"Progression Report - {current_user.name}")
+
+    progressions = get_user_progressions(session, current_user.id)
+
+    if not progressions:
+        print("\n  No workout data available yet.")
+        return
+
+    catalog.ensure_loaded(session)
+    rows = sorted(
+        (catalog.get(exercise_id).name, progression) for exercise_id, progression in progressions.items()
+    )
+
+    print(f"\n    {'Exercise':<28} {'Est. 1RM':>9} {'Best':>9} {'lbs/wk':>8}  Status")
+    for name, progression in rows:
+        status = "PLATEAU" if progression.plateau else ("rising" if progression.recent_trend_per_week > 0 else "")
+        print(
+            f"    {name:<28}"
+            f" {progression.latest.epley:>9.1f} {progression.best_estimate:>9.1f}"
+            f" {progression.recent_trend_per_week:>+8.1f}  {status}"
+        )
+
+    plateaus = sum(1 for progression in progressions.values() if progression.plateau)
+    if plateaus:
+        print(f"\n  {plateaus} lift(s) not up more than {PLATEAU_TOLERANCE:.0%} in {PLATEAU_SESSIONS}+ sessions.")
+        print("  Consider changing rep ranges, adding volume or taking a deload week.")
+
+    input("\n  Press Enter to continue...")
+
+
+def view_training_trends(session):
+
+    current_user = get_current_user(session)
+    if not current_user:
+        print("\n Please select or create a user first!")
+        return
+
+    print_subheader(f"Training Trends - {current_user.name}")
+
+    print("\n  1. Weekly (last 12 weeks)")
+    print("  2. Monthly (last 12 months)")
+    print("  3. Daily (last 14 days)")
+
+    choice = input("\n  Enter choice: ").strip()
+    period, periods, title = {
+        '1': ('week', 12, "WEEKLY"),
+        '2': ('month', 12, "MONTHLY"),
+        '3': ('day', 14, "DAILY"),
+    }.get(choice, (None, None, None))
+    if period is None:
+        print(" Invalid choice.")
+        return
+
+    muscle_groups = get_trained_muscle_groups(session, current_user.id)
+    if not muscle_groups:
+        print("\n  No workout data available yet.")
+        return
+
+    print("\n  Muscle groups: " + ", ".join(muscle_groups))
+    muscle_group = input("  Filter by muscle group (blank for all): ").strip()
+    matches = [group for group in muscle_groups if group.lower() == muscle_group.lower()]
+    if muscle_group and not matches:
+        print(f"\n  No workouts logged for '{muscle_group}'")
+        return
+    muscle_group = matches[0] if matches else None
+
+    trend = get_volume_trend(session, current_user.id, period=period, periods=periods, muscle_group=muscle_group)
+
+    print("\n" + "="*60)
+    print(f"  {title} VOLUME - {muscle_group or 'All Muscle Groups'}")
+    print("="*60 + "\n")
+    print_bar_chart([
+        (point.period_start.strftime('%Y-%m') if period == 'month' else point.period_start, point.total_volume)
+        for point in trend
+    ])
+
+    active = [point for point in trend if point.total_volume]
+    if active:
+        average = sum(point.total_volume for point in active) / len(active)
+        print(f"\n  Active {period}s: {len(active)} of {len(trend)}")
+        print(f"  Average volume per active {period}: {average:,.1f} lbs")
+        print(f"  Total sets: {sum(point.total_sets for point in trend)}"
+              f" | Total reps: {sum(point.total_reps for point in trend)}")
+
+    if not muscle_group:
+        breakdown = get_muscle_group_breakdown(session, current_user.id)
+        if breakdown:
+            print("\n  This month by muscle group:\n")
+            print_bar_chart(breakdown, width=30)
+
+    input("\n  Press Enter to continue...")
+
+
+def show_weekly_volume_leaderboard(session):
+
+    print_subheader("Weekly Volume Leaderboard")
+
+    rows = get_weekly_volume_leaderboard(session, weeks=4, limit=5)
+
+    if not rows:
+        print("\n  No workouts logged in the last 4 weeks.")
+        return
+
+    current_week = None
+    for row in rows:
+        if row.week_start != current_week:
+            current_week = row.week_start
+            print(f"\n  === Week of {current_week} ===")
+        print(f"    {row.rank}. {row.name:<25} {row.total_volume:>12,.1f} lbs  ({row.workouts} workouts)")
+
+
+def show_exercise_record_leaderboard(session):
+
+    print_subheader("Exercise Records Leaderboard")
+
+    search_term = input("\n  Search exercise by name (blank for all): ").strip()
+
+    exercise_id = None
+    if search_term:
+        exercises = catalog.search(session, search_term)
+        if not exercises:
+            print(f"\n  No exercises found matching '{search_term}'")
+            return
+        display_exercise_list(exercises)
+        exercise = get_exercise_choice(session, exercises)
+        if not exercise:
+            return
+        exercise_id = exercise.id
+
+    rows = get_exercise_record_leaderboard(session, exercise_id=exercise_id, limit=5)
+
+    if not rows:
+        print("\n  No records yet.")
+        return
+
+    current_exercise = None
+    for row in rows:
+        if row.exercise_id != current_exercise:
+            current_exercise = row.exercise_id
+            print(f"\n  === {row.exercise_name} ===")
+        print(
+            f"    {row.rank}. {row.name:<25} {row.max_weight} lbs x {row.reps_at_max_weight}"
+            f"  (Est. 1RM: {row.estimated_one_rep_max:.1f} lbs)"
+        )
+
+
+def show_streak_leaderboard(session):
+
+    print_subheader("Consistency Streaks (consecutive training weeks)")
+
+    rows = get_streak_leaderboard(session, limit=10)
+
+    if not rows:
+        print("\n  No workouts logged yet.")
+        return
+
+    print(f"\n    {'':<3} {'User':<25} {'Current':>8} {'Longest':>8}")
+    for row in rows:
+        print(f"    {row.rank:<3} {row.name:<25} {row.current_streak:>8} {row.longest_streak:>8}")
+
+
+def leaderboard_menu(session):
+
+    while True:
+        print_subheader("Gym Leaderboards")
+
+        print("\n  1. Weekly Volume")
+        print("  2. Exercise Records")
+        print("  3. Consistency Streaks")
+        print("  r. Refresh")
+        print("  0. Back to Main Menu")
+
+        choice = input("\n  Enter choice: ").strip().lower()
+
+        if choice == '1':
+            show_weekly_volume_leaderboard(session)
+        elif choice == '2':
+            show_exercise_record_leaderboard(session)
+        elif choice == '3':
+            show_streak_leaderboard(session)
+        elif choice == 'r':
+            leaderboard_cache.invalidate()
+            print("\n  Leaderboards will be recalculated.")
+            continue
+        elif choice == '0':
+            break
+        else:
+            print("Invalid choice. Please try again.")
+            continue
+
+        input("\n  Press Enter to continue...")
 
 
 def search_exercises(session):
@@ -413,6 +683,7 @@ def search_exercises(session):
     print("  1. Search by name")
     print("  2. Browse by muscle group")
     print("  3. View all exercises")
+    print("  4. Most popular exercises")
     print("  0. Cancel")
     
     choice = input("\n  Enter choice: ").strip()
@@ -424,7 +695,7 @@ def search_exercises(session):
             print(" Search term cannot be empty.")
             return
         
-        exercises = Exercise.search_by_name(session, search_term)
+        exercises = catalog.search(session, search_term)
         display_exercise_list(exercises)
         
     elif choice == '2':
@@ -442,14 +713,14 @@ def search_exercises(session):
         )
         
         selected_muscle_group = muscle_groups[mg_choice - 1]
-        exercises = Exercise.filter_by_muscle_group(session, selected_muscle_group)
+        catalog.ensure_loaded(session)
+        exercises = catalog.filter_by_muscle_group(selected_muscle_group)
         display_exercise_list(exercises)
         
     elif choice == '3':
 
-        exercises = session.query(Exercise).order_by(
-            Exercise.muscle_group, Exercise.name
-        ).all()
+        catalog.ensure_loaded(session)
+        exercises = catalog.all_exercises()
         
         if not exercises:
             print("\n  No exercises in library.")
@@ -470,6 +741,24 @@ def search_exercises(session):
                 print(f"     {exercise.name}")
                 if exercise.equipment_needed:
                     print(f"      Equipment: {exercise.equipment_needed}")
+
+    elif choice == '4':
+
+        popular = services.search_exercises(session, popular=True, limit=POPULAR_EXERCISES)
+        print("\n  Most Logged in the Gym:\n")
+        for idx, record in enumerate(popular, 1):
+            print(f"  {idx:>2}. {record['name']:<28} {record['muscle_group']:<10} {record['usage_count']:>7,}")
+
+        current_user = get_current_user(session)
+        if current_user:
+            mine = services.search_exercises(
+                session, popular=True, user_id=current_user.id, limit=POPULAR_EXERCISES
+            )
+            print(f"\n  Most Logged by {current_user.name}:\n")
+            if not mine:
+                print("  No workouts logged yet.")
+            for idx, record in enumerate(mine, 1):
+                print(f"  {idx:>2}. {record['name']:<28} {record['muscle_group']:<10} {record['user_usage_count']:>7,}")
     
     elif choice == '0':
         return
@@ -489,7 +778,8 @@ def add_custom_exercise(session):
         print(" Exercise name cannot be empty.")
         return
     
-    existing = session.query(Exercise).filter_by(name=name).first()
+    catalog.ensure_loaded(session)
+    existing = catalog.find_by_name(name)
     if existing:
         print(f" Exercise '{name}' already exists in the library.")
         return
@@ -525,33 +815,53 @@ def add_custom_exercise(session):
     
     session.add(new_exercise)
     session.commit()
+    catalog.add(new_exercise)
     
     print(f"\n Custom exercise '{name}' added successfully!")
 
 
 
+MENU_ACTIONS = {
+    '1': user_management_menu,
+    '2': log_workout,
+    '3': view_workout_history,
+    '4': view_exercise_history,
+    '5': view_statistics,
+    '6': search_exercises,
+    '7': add_custom_exercise,
+    '8': view_personal_records,
+    '9': leaderboard_menu,
+    '10': view_training_trends,
+    '11': view_progression_report,
+}
+
+
 def main_menu():
   
     print("Initializing Fitness Tracker...")
     init_db()
     
-    session = get_session()
-    
-    exercise_count = session.query(Exercise).count()
-    if exercise_count == 0:
+    with session_scope() as session:
+        library_empty = session.scalar(select(Exercise.id).limit(1)) is None
+
+    if library_empty:
         print("\n! Exercise library is empty.")
         if confirm_action("Would you like to populate it with default exercises?"):
+            from lib.seed import seed_database
             seed_database()
+            catalog.invalidate()
 
     while True:
     
         print_header("FITNESS TRACKER & WORKOUT PLANNER")
     
-        if current_user:
-            print(f"\n  Current User: {current_user.name}")
-            print(f"  Workouts Logged: {current_user.get_workout_count()}")
-        else:
-            print("\n  No user selected - Please create or select a user")
+        with session_scope() as session:
+            current_user = get_current_user(session)
+            if current_user:
+                print(f"\n  Current User: {current_user.name}")
+                print(f"  Workouts Logged: {current_user.get_workout_count()}")
+            else:
+                print("\n  No user selected - Please create or select a user")
         
         print("\n  MAIN MENU:")
         print("  1. User Management (Create/Switch User)")
@@ -561,31 +871,26 @@ def main_menu():
         print("  5. View Statistics")
         print("  6. Search Exercise Library")
         print("  7. Add Custom Exercise")
+        print("  8. Personal Records Board")
+        print("  9. Gym Leaderboards")
+        print("  10. Training Trends")
+        print("  11. Progression Report")
         print("  0. Exit")
     
         choice = input("\n  Enter your choice: ").strip()
         
-        if choice == '1':
-            user_management_menu(session)
-        elif choice == '2':
-            log_workout(session)
-        elif choice == '3':
-            view_workout_history(session)
-        elif choice == '4':
-            view_exercise_history(session)
-        elif choice == '5':
-            view_statistics(session)
-        elif choice == '6':
-            search_exercises(session)
-        elif choice == '7':
-            add_custom_exercise(session)
+        action = MENU_ACTIONS.get(choice)
+        if action:
+            # A fresh session per screen; whatever it loaded is released
+            # when the screen returns.
+            with session_scope() as session, profiler.action(action.__name__):
+                action(session)
         elif choice == '0':
 
             print("\n" + "="*60)
             print("  Thank you for using Fitness Tracker!")
             print("  Keep pushing your limits! ")
             print("="*60 + "\n")
-            session.close()
             sys.exit(0)
         else:
             print("\n Invalid choice. Please enter a number from the menu.")
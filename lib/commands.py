@@ -0,0 +1,202 @@
+import argparse
+import json
+import sys
+from datetime import datetime
+
+# Scriptable entry point: `python -m lib.cli <command> ...`. Each command
+# opens a session, does one thing and prints JSON (one object per line for
+# listings) to stdout. The schema is only migrated when its Alembic
+# revision isn't the head, and nothing seeds data or loads the exercise
+# catalog, so scheduled jobs only pay for the work they ask for. Errors go
+# to stderr with a non-zero exit status.
+
+
+def emit(record):
+
+    print(json.dumps(record, default=str))
+
+
+def parse_date(value):
+
+    if value.lower() == 'today':
+        return datetime.now().date()
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (use YYYY-MM-DD or 'today')")
+
+
+def parse_exercise_entry(value):
+    # "Bench Press:3:10:135" -> (name, sets, reps, weight)
+
+    try:
+        name, sets, reps, weight = value.rsplit(':', 3)
+        entry = (name.strip(), int(sets), int(reps), float(weight))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid exercise '{value}' (use NAME:SETS:REPS:WEIGHT)")
+
+    if not entry[0] or entry[1] < 1 or entry[2] < 1 or entry[3] < 0:
+        raise argparse.ArgumentTypeError(f"invalid exercise '{value}'")
+    return entry
+
+
+def stats_command(session, args):
+
+    from sqlalchemy import select
+    from lib.models import User, UserStats
+    from lib.services import get_statistics
+
+    if args.user is None:
+        rows = session.execute(
+            select(User.id, User.name, UserStats.workout_count, UserStats.exercise_count,
+                   UserStats.total_volume, UserStats.first_workout_date, UserStats.last_workout_date)
+            .outerjoin(UserStats, UserStats.user_id == User.id)
+            .order_by(User.id)
+        )
+        for row in rows:
+            emit({
+                'user_id': row.id,
+                'name': row.name,
+                'total_workouts': row.workout_count or 0,
+                'total_exercises': row.exercise_count or 0,
+                'total_volume': row.total_volume or 0.0,
+                'first_workout': row.first_workout_date,
+                'last_workout': row.last_workout_date,
+            })
+        return
+
+    emit(get_statistics(session, args.user, top_n=args.top))
+
+
+def history_command(session, args):
+
+    from itertools import islice
+    from lib.history import iter_workout_history
+    from lib.services import require_user, workout_record
+
+    require_user(session, args.user)
+    workouts = iter_workout_history(session, args.user)
+    if args.limit:
+        workouts = islice(workouts, args.limit)
+
+    for workout in workouts:
+        emit(workout_record(workout))
+
+
+def log_command(session, args):
+
+    from lib.services import log_workout
+
+    emit(log_workout(
+        session, args.user,
+        [
+            {'exercise': name, 'sets': sets, 'reps': reps, 'weight': weight}
+            for name, sets, reps, weight in args.exercise
+        ],
+        workout_date=args.date,
+        notes=args.notes
+    ))
+
+
+def search_command(session, args):
+
+    from lib.services import search_exercises
+
+    for record in search_exercises(
+        session, args.term, args.muscle_group, popular=args.popular, user_id=args.user, limit=args.limit
+    ):
+        emit(record)
+
+
+def export_command(session, args):
+
+    from lib.exporter import export_workouts, detect_format, open_output
+
+    file_format = args.format or detect_format(args.path)
+    stream = open_output(args.path, file_format)
+    try:
+        count = export_workouts(session, stream, file_format, user_id=args.user)
+    finally:
+        if stream not in (sys.stdout, sys.stdout.buffer):
+            stream.close()
+
+    if args.path != '-':
+        emit({'path': args.path, 'format': file_format, 'rows': count})
+
+
+def build_parser():
+
+    parser = argparse.ArgumentParser(
+        prog='python -m lib.cli',
+        description="Fitness Tracker. Run without a command for the interactive menu."
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    stats = commands.add_parser('stats', help="workout statistics as JSON")
+    stats.add_argument('--user', type=int, help="user id (default: a summary line for every user)")
+    stats.add_argument('--top', type=int, default=5, help="number of most trained exercises")
+    stats.set_defaults(handler=stats_command)
+
+    history = commands.add_parser('history', help="a user's workouts, newest first, as JSON lines")
+    history.add_argument('--user', type=int, required=True)
+    history.add_argument('--limit', type=int, help="stop after this many workouts")
+    history.set_defaults(handler=history_command)
+
+    log = commands.add_parser('log', help="log a workout")
+    log.add_argument('--user', type=int, required=True)
+    log.add_argument('--date', type=parse_date, default='today')
+    log.add_argument('--notes')
+    log.add_argument('--exercise', type=parse_exercise_entry, action='append', required=True,
+                     metavar='NAME:SETS:REPS:WEIGHT', help="repeat for each exercise")
+    log.set_defaults(handler=log_command)
+
+    search = commands.add_parser('search', help="search the exercise library")
+    search.add_argument('term', nargs='?')
+    search.add_argument('--muscle-group')
+    search.add_argument('--popular', action='store_true',
+                        help="most logged first (with no term: browse the whole library)")
+    search.add_argument('--user', type=int, help="with --popular, rank by this user's own usage")
+    search.add_argument('--limit', type=int)
+    search.set_defaults(handler=search_command)
+
+    export = commands.add_parser('export', help="export workout history")
+    export.add_argument('path', help="output file ('-' for stdout)")
+    export.add_argument('--format', choices=('csv', 'jsonl', 'columnar'), help="defaults to the file extension")
+    export.add_argument('--user', type=int, help="only export this user id")
+    export.set_defaults(handler=export_command)
+
+    return parser
+
+
+def main(argv=None):
+
+    args = build_parser().parse_args(argv)
+
+    from contextlib import redirect_stdout
+    from sqlalchemy.exc import SQLAlchemyError
+    from lib.database import get_session, init_db, schema_is_current
+    from lib.profiling import profiler
+    from lib.services import ServiceError
+
+    try:
+        if not schema_is_current():
+            # stdout is for the command's JSON.
+            with redirect_stdout(sys.stderr):
+                init_db()
+    except SQLAlchemyError as e:
+        print(f"error: database: {e}", file=sys.stderr)
+        return 1
+
+    session = get_session()
+    try:
+        with profiler.action(args.command):
+            args.handler(session, args)
+    except ServiceError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except SQLAlchemyError as e:
+        print(f"error: database: {e}", file=sys.stderr)
+        return 1
+    finally:
+        session.close()
+    return 0
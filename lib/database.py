@@ -1,25 +1,199 @@
-from sqlalchemy import create_engine
+import os
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 Base = declarative_base()
 
-DATABASE_URL = "sqlite:///fitness_tracker.db"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-engine = create_engine(
-    DATABASE_URL, 
-    echo=False,
-    connect_args = {"check_same_thread": False}
+DATABASE_URL = os.environ.get(
+    "FITNESS_TRACKER_DATABASE_URL",
+    f"sqlite:///{os.path.join(PROJECT_ROOT, 'fitness_tracker.db')}"
 )
 
+# PRAGMAs applied to every new SQLite connection. 'tuned' lets readers keep
+# going while a workout is being written (WAL) and trades a little durability
+# on power loss (synchronous=NORMAL) for far fewer fsyncs. 'default' leaves
+# SQLite's own settings alone.
+SQLITE_PROFILES = {
+    'tuned': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+    'default': {},
+}
+
+SQLITE_PROFILE = os.environ.get("FITNESS_TRACKER_SQLITE_PROFILE", "tuned")
+
+
+def is_sqlite_file(url):
+
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def create_tuned_engine(url=DATABASE_URL, profile=SQLITE_PROFILE, echo=False,
+                        pool_size=5, max_overflow=10):
+
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile '{profile}' (choose from {', '.join(SQLITE_PROFILES)})")
+
+    options = {'echo': echo}
+
+    if is_sqlite_file(url):
+        options.update(
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow
+        )
+
+    new_engine = create_engine(url, **options)
+    install_pragmas(new_engine, profile)
+    return new_engine
+
+
+def install_pragmas(sync_engine, profile):
+
+    pragmas = SQLITE_PROFILES[profile]
+    if pragmas and sync_engine.dialect.name == 'sqlite':
+        event.listen(
+            sync_engine, "connect",
+            lambda dbapi_connection, connection_record: apply_pragmas(dbapi_connection, pragmas)
+        )
+
+
+def async_database_url(url):
+    # The asyncio driver for a sync URL: sqlite:///x.db -> sqlite+aiosqlite:///x.db
+
+    url = make_url(url)
+    if url.get_backend_name() == 'sqlite' and url.get_driver_name() in ('pysqlite', 'sqlite'):
+        url = url.set(drivername='sqlite+aiosqlite')
+    return url
+
+
+def create_tuned_async_engine(url=DATABASE_URL, profile=SQLITE_PROFILE, echo=False,
+                              pool_size=5, max_overflow=10):
+    # Same profiles as create_tuned_engine, for the asyncio API. Needs the
+    # aiosqlite driver for SQLite databases.
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile '{profile}' (choose from {', '.join(SQLITE_PROFILES)})")
+
+    options = {'echo': echo}
+    if is_sqlite_file(url):
+        options.update(poolclass=AsyncAdaptedQueuePool, pool_size=pool_size, max_overflow=max_overflow)
+
+    new_engine = create_async_engine(async_database_url(url), **options)
+    install_pragmas(new_engine.sync_engine, profile)
+    return new_engine
+
+
+engine = create_tuned_engine()
+
 sessionLocal = sessionmaker(bind = engine)
 
+# Opt-in statement/lazy-load profiling per CLI action; see lib.profiling.
+PROFILE = os.environ.get("FITNESS_TRACKER_PROFILE", "")
+if PROFILE:
+    from lib.profiling import profiler
+    profiler.install(engine, sessionLocal, PROFILE)
+
+# The Alembic migrations are the one record of the schema version, and
+# init_db applies them: a new database gets the current schema from the
+# models and is stamped with the head revision, any other database not at
+# head is upgraded. Databases from before the migrations existed have
+# tables but no alembic_version and are stamped with the baseline first.
+MIGRATIONS_DIR = os.path.join(PROJECT_ROOT, 'migrations')
+BASELINE_REVISION = '0001'
+# Newest revision in migrations/versions; bump it with every migration
+# (tests/test_database.py checks). A constant keeps the check on every
+# start from importing alembic, which costs more than the command itself.
+HEAD_REVISION = '0009'
+
+
+def get_schema_revision(connection):
+
+    if not inspect(connection).has_table('alembic_version'):
+        return None
+    return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def schema_is_current():
+
+    with engine.connect() as connection:
+        return get_schema_revision(connection) == HEAD_REVISION
+
+
+def alembic_config(connection):
+
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option('script_location', MIGRATIONS_DIR)
+    config.attributes['connection'] = connection
+    return config
+
+
 def init_db():
-    from lib.models import User, Workout, Exercise, WorkoutExercise
 
-    Base.metadata.create_all(bind=engine)
+    if schema_is_current():
+        return
+
+    from alembic import command
+    import lib.models  # noqa: F401  (registers the tables on Base.metadata)
+    from lib.search import install_search_index
+
+    with engine.begin() as connection:
+        config = alembic_config(connection)
+        if not inspect(connection).get_table_names():
+            Base.metadata.create_all(bind=connection)
+            install_search_index(connection)
+            command.stamp(config, 'head')
+        else:
+            if get_schema_revision(connection) is None:
+                command.stamp(config, BASELINE_REVISION)
+            command.upgrade(config, 'head')
     print("Database initialized sussessfully!")
 
 
 
 def get_session():
-    return sessionLocal()
\ No newline at end of file
+    return sessionLocal()
+
+
+@contextmanager
+def session_scope():
+    # One unit of work: commits when the block finishes, rolls back if it
+    # raises, and always closes the session so everything it loaded can be
+    # garbage collected.
+
+    session = sessionLocal()
+    try:
+        yield session
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        session.close()
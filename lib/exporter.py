@@ -0,0 +1,257 @@
+import argparse
+import csv
+import json
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date
+from sqlalchemy import select
+from lib.models import Workout, WorkoutExercise, Exercise
+
+# Streams workout history out of the database without materializing it.
+# Rows come from a column-only query iterated with yield_per, so memory use
+# depends on the batch size, not on the size of the history.
+#
+# CSV and JSON Lines use the same fields as lib.importer, so an export can
+# be imported again. The columnar format is a compact binary layout for
+# analytics: row groups of typed, zlib-compressed column blocks.
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'columnar')
+DEFAULT_BATCH_SIZE = 2000
+
+EXPORT_COLUMNS = (
+    ('user', 'int'),
+    ('workout_id', 'int'),
+    ('date', 'date'),
+    ('exercise', 'str'),
+    ('muscle_group', 'str'),
+    ('sets', 'int'),
+    ('reps', 'int'),
+    ('weight', 'float'),
+    ('notes', 'str'),
+    ('workout_notes', 'str'),
+)
+EXPORT_FIELDS = [name for name, _ in EXPORT_COLUMNS]
+
+COLUMNAR_MAGIC = b'FTCOL1\n'
+NULL_LENGTH = 0xFFFFFFFF
+
+
+def export_query(user_id=None):
+
+    query = (
+        select(
+            Workout.user_id,
+            Workout.id,
+            Workout.workout_date,
+            Exercise.name,
+            Exercise.muscle_group,
+            WorkoutExercise.sets,
+            WorkoutExercise.reps,
+            WorkoutExercise.weight,
+            WorkoutExercise.notes,
+            Workout.notes
+        )
+        .join(Workout, WorkoutExercise.workout_id == Workout.id)
+        .join(Exercise, WorkoutExercise.exercise_id == Exercise.id)
+        .order_by(Workout.user_id, Workout.workout_date, Workout.id, WorkoutExercise.id)
+    )
+    if user_id is not None:
+        query = query.where(Workout.user_id == user_id)
+    return query
+
+
+def iter_export_rows(session, user_id=None, batch_size=DEFAULT_BATCH_SIZE):
+
+    result = session.execute(export_query(user_id).execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        for row in partition:
+            yield tuple(row)
+
+
+def write_csv(rows, stream):
+
+    writer = csv.writer(stream)
+    writer.writerow(EXPORT_FIELDS)
+    count = 0
+    for row in rows:
+        writer.writerow(['' if value is None else value for value in row])
+        count += 1
+    return count
+
+
+def write_jsonl(rows, stream):
+
+    count = 0
+    for row in rows:
+        record = dict(zip(EXPORT_FIELDS, row))
+        record['date'] = record['date'].isoformat()
+        stream.write(json.dumps(record) + '\n')
+        count += 1
+    return count
+
+
+def encode_column(values, column_type):
+
+    if column_type == 'int':
+        return array('q', values).tobytes()
+    if column_type == 'float':
+        return array('d', values).tobytes()
+    if column_type == 'date':
+        return array('i', [value.toordinal() for value in values]).tobytes()
+
+    lengths = array('I')
+    blob = bytearray()
+    for value in values:
+        if value is None:
+            lengths.append(NULL_LENGTH)
+        else:
+            encoded = value.encode('utf-8')
+            lengths.append(len(encoded))
+            blob += encoded
+    return lengths.tobytes() + bytes(blob)
+
+
+def decode_column(data, column_type, row_count):
+
+    if column_type in ('int', 'float', 'date'):
+        values = array({'int': 'q', 'float': 'd', 'date': 'i'}[column_type])
+        values.frombytes(data)
+        if column_type == 'date':
+            return [date.fromordinal(value) for value in values]
+        return values.tolist()
+
+    lengths = array('I')
+    lengths.frombytes(data[:row_count * lengths.itemsize])
+    offset = row_count * lengths.itemsize
+    values = []
+    for length in lengths:
+        if length == NULL_LENGTH:
+            values.append(None)
+        else:
+            values.append(data[offset:offset + length].decode('utf-8'))
+            offset += length
+    return values
+
+
+def write_row_group(stream, rows):
+
+    stream.write(struct.pack('<I', len(rows)))
+    for index, (_, column_type) in enumerate(EXPORT_COLUMNS):
+        block = zlib.compress(encode_column([row[index] for row in rows], column_type))
+        stream.write(struct.pack('<Q', len(block)))
+        stream.write(block)
+
+
+def write_columnar(rows, stream, row_group_size=50000):
+
+    header = json.dumps({'columns': EXPORT_COLUMNS}).encode('utf-8')
+    stream.write(COLUMNAR_MAGIC)
+    stream.write(struct.pack('<I', len(header)))
+    stream.write(header)
+
+    count = 0
+    group = []
+    for row in rows:
+        group.append(row)
+        if len(group) >= row_group_size:
+            write_row_group(stream, group)
+            count += len(group)
+            group = []
+
+    if group:
+        write_row_group(stream, group)
+        count += len(group)
+
+    stream.write(struct.pack('<I', 0))
+    return count
+
+
+def read_columnar(stream, columns=None):
+    # Yields {column: [values]} per row group; columns not asked for are
+    # skipped without being decompressed.
+
+    if stream.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a fitness tracker columnar export")
+
+    header_length, = struct.unpack('<I', stream.read(4))
+    schema = json.loads(stream.read(header_length))['columns']
+    wanted = set(columns or [name for name, _ in schema])
+    # stdin and pipes can't seek; skipped blocks are read and dropped there.
+    seekable = stream.seekable()
+
+    while True:
+        row_count, = struct.unpack('<I', stream.read(4))
+        if row_count == 0:
+            return
+
+        group = {}
+        for name, column_type in schema:
+            block_length, = struct.unpack('<Q', stream.read(8))
+            if name in wanted:
+                group[name] = decode_column(zlib.decompress(stream.read(block_length)), column_type, row_count)
+            elif seekable:
+                stream.seek(block_length, 1)
+            else:
+                stream.read(block_length)
+        yield group
+
+
+def export_workouts(session, stream, file_format='csv', user_id=None, batch_size=DEFAULT_BATCH_SIZE):
+
+    rows = iter_export_rows(session, user_id=user_id, batch_size=batch_size)
+
+    if file_format == 'csv':
+        return write_csv(rows, stream)
+    if file_format == 'jsonl':
+        return write_jsonl(rows, stream)
+    if file_format == 'columnar':
+        return write_columnar(rows, stream)
+    raise ValueError(f"Unsupported export format '{file_format}'")
+
+
+def detect_format(path):
+
+    lowered = path.lower()
+    if lowered.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if lowered.endswith(('.ftc', '.col')):
+        return 'columnar'
+    return 'csv'
+
+
+def open_output(path, file_format):
+
+    if file_format == 'columnar':
+        return sys.stdout.buffer if path == '-' else open(path, 'wb')
+    return sys.stdout if path == '-' else open(path, 'w', newline='', encoding='utf-8')
+
+
+if __name__ == "__main__":
+
+    from lib.database import get_session
+
+    parser = argparse.ArgumentParser(description="Export workout history")
+    parser.add_argument('path', help="output file ('-' for stdout)")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, help="defaults to the file extension")
+    parser.add_argument('--user', type=int, help="only export this user id")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    session = get_session()
+    file_format = args.format or detect_format(args.path)
+
+    try:
+        stream = open_output(args.path, file_format)
+        try:
+            count = export_workouts(session, stream, file_format, user_id=args.user, batch_size=args.batch_size)
+        finally:
+            if stream not in (sys.stdout, sys.stdout.buffer):
+                stream.close()
+        print(f" Exported {count:,} rows", file=sys.stderr)
+    except Exception as e:
+        print(f"Error during export: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        session.close()
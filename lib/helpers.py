@@ -64,6 +64,17 @@ def get_valid_date(prompt):
         except ValueError:
             print("Invalid date format. Please use YYYY-MM-DD (or type 'today')")
 
+def calculate_one_rep_max(weight, reps, formula="epley"):
+    # Epley by default; Brzycki reads a little lower for sets under 10 reps
+    # and is undefined from 37 reps up, where Epley is used instead.
+    # A single rep is already a true max.
+
+    if reps <= 1:
+        return float(weight)
+    if formula == "brzycki" and reps < 37:
+        return weight * 36 / (37 - reps)
+    return weight * (1 + reps / 30)
+
 def format_workout_summary(workout):
     exercise_lines = []
     
@@ -82,6 +93,17 @@ def format_workout_summary(workout):
 """
     return summary
 
+def print_bar_chart(rows, width=40, unit="lbs"):
+    # rows: (label, value) pairs; bars are scaled to the largest value.
+
+    peak = max((value for _, value in rows), default=0)
+    label_width = max((len(str(label)) for label, _ in rows), default=0)
+
+    for label, value in rows:
+        length = round(value / peak * width) if peak else 0
+        bar = "#" * length if length or not value else "."
+        print(f"  {str(label):<{label_width}} |{bar:<{width}} {value:,.0f} {unit}")
+
 def display_exercise_list(exercises):
     if not exercises:
         print("  No exercises found.")
@@ -0,0 +1,167 @@
+from dataclasses import dataclass, field
+from sqlalchemy import select, tuple_
+from lib.models import Workout, WorkoutExercise, Exercise
+
+HISTORY_PAGE_SIZE = 10
+
+# History screens only read a handful of columns, so they get plain
+# slotted rows built from column-only selects instead of ORM instances
+# with change tracking and relationship state. The rows expose the same
+# attributes and helpers as the models where the display code uses them.
+
+
+@dataclass(frozen=True, slots=True)
+class WorkoutEntryRow:
+
+    exercise_id: int
+    exercise_name: str
+    sets: int
+    reps: int
+    weight: float
+    notes: str = None
+
+    def calculate_volume(self):
+
+        return self.sets * self.reps * self.weight
+
+    def get_exercise_name(self):
+
+        return self.exercise_name
+
+
+@dataclass(frozen=True, slots=True)
+class WorkoutRow:
+
+    id: int
+    workout_date: object
+    notes: str = None
+    duration: int = None
+    workout_exercises: list = field(default_factory=list)
+
+    def get_total_volume(self):
+
+        return sum(entry.calculate_volume() for entry in self.workout_exercises)
+
+
+@dataclass(frozen=True, slots=True)
+class ExerciseSessionRow:
+
+    workout_id: int
+    workout_date: object
+    sets: int
+    reps: int
+    weight: float
+    notes: str = None
+
+    def calculate_volume(self):
+
+        return self.sets * self.reps * self.weight
+
+
+def workout_history_query(user_id):
+
+    return (
+        select(Workout.id, Workout.workout_date, Workout.notes, Workout.duration)
+        .where(Workout.user_id == user_id)
+        .order_by(Workout.workout_date.desc(), Workout.id.desc())
+    )
+
+
+def workout_entries_query(workout_ids):
+
+    return (
+        select(
+            WorkoutExercise.workout_id,
+            WorkoutExercise.exercise_id,
+            Exercise.name,
+            WorkoutExercise.sets,
+            WorkoutExercise.reps,
+            WorkoutExercise.weight,
+            WorkoutExercise.notes
+        )
+        .join(Exercise, WorkoutExercise.exercise_id == Exercise.id)
+        .where(WorkoutExercise.workout_id.in_(workout_ids))
+        .order_by(WorkoutExercise.workout_id, WorkoutExercise.id)
+    )
+
+
+def load_workout_rows(session, rows):
+    # WorkoutRows for (id, date, notes, duration) rows, with their exercises
+    # fetched in one more query.
+
+    workouts = [WorkoutRow(*row) for row in rows]
+    by_id = {workout.id: workout for workout in workouts}
+    if by_id:
+        for workout_id, *entry in session.execute(workout_entries_query(list(by_id))):
+            by_id[workout_id].workout_exercises.append(WorkoutEntryRow(*entry))
+    return workouts
+
+
+def workout_cursor(workout):
+
+    return (workout.workout_date, workout.id)
+
+
+def get_workout_page(session, user_id, page_size=HISTORY_PAGE_SIZE, after=None, before=None):
+    # Keyset pagination on (workout_date, id), newest first. `after` is the
+    # cursor of the last row on the current page, `before` of the first one.
+    # Returns the page and whether more rows exist in the direction of travel.
+
+    key = tuple_(Workout.workout_date, Workout.id)
+    query = workout_history_query(user_id)
+
+    if before is not None:
+        query = query.where(key > tuple_(*before)).order_by(None).order_by(
+            Workout.workout_date.asc(), Workout.id.asc()
+        )
+    elif after is not None:
+        query = query.where(key < tuple_(*after))
+
+    rows = session.execute(query.limit(page_size + 1)).all()
+    has_more = len(rows) > page_size
+    workouts = load_workout_rows(session, rows[:page_size])
+
+    if before is not None:
+        workouts.reverse()
+
+    return workouts, has_more
+
+
+def iter_workout_history(session, user_id, page_size=HISTORY_PAGE_SIZE):
+
+    cursor = None
+    while True:
+        workouts, has_more = get_workout_page(session, user_id, page_size, after=cursor)
+        yield from workouts
+
+        if not has_more:
+            return
+        cursor = workout_cursor(workouts[-1])
+
+
+def get_workout_history(session, user_id):
+
+    return list(iter_workout_history(session, user_id))
+
+
+def exercise_history_query(user_id, exercise_id):
+
+    return (
+        select(
+            Workout.id,
+            Workout.workout_date,
+            WorkoutExercise.sets,
+            WorkoutExercise.reps,
+            WorkoutExercise.weight,
+            WorkoutExercise.notes
+        )
+        .join(Workout, WorkoutExercise.workout_id == Workout.id)
+        .where(Workout.user_id == user_id, WorkoutExercise.exercise_id == exercise_id)
+        .order_by(Workout.workout_date.desc(), Workout.id.desc())
+    )
+
+
+def get_exercise_history(session, user_id, exercise_id):
+    # Every session of one exercise for a user, newest first.
+
+    return [ExerciseSessionRow(*row) for row in session.execute(exercise_history_query(user_id, exercise_id))]
@@ -0,0 +1,268 @@
+import argparse
+import csv
+import json
+import math
+import sys
+from datetime import datetime
+from itertools import groupby
+from sqlalchemy import select, insert
+from lib.models import User, Exercise, Workout, WorkoutExercise
+from lib.aggregates import apply_workouts
+
+# Streams workout logs from CSV or JSON Lines files into the database.
+# Each record is one exercise entry:
+#
+#   user, date, exercise, sets, reps, weight, notes, workout_notes
+#
+# `user` is a user id or name, `date` is YYYY-MM-DD; `notes` and
+# `workout_notes` are optional. Consecutive records for the same user and
+# date become one workout. Rows are written in chunks, each chunk in its
+# own transaction together with its summary-table updates, so memory stays
+# bounded by the chunk size rather than the file size.
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class ImportStats:
+
+    def __init__(self):
+
+        self.rows_read = 0
+        self.rows_imported = 0
+        self.workouts_created = 0
+        self.users_created = 0
+        self.skipped = {}
+
+    def skip(self, reason):
+
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    @property
+    def rows_skipped(self):
+
+        return sum(self.skipped.values())
+
+
+def detect_format(path):
+
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def read_records(stream, file_format):
+
+    if file_format == 'csv':
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Counted and skipped by normalize_records like any other
+                # record that isn't an object.
+                yield None
+
+
+class NameResolver:
+    # Preloaded lowercase name -> id maps, so resolving a record is a dict hit.
+
+    def __init__(self, session, create_users=False):
+
+        self.session = session
+        self.create_users = create_users
+        self.exercise_ids = {
+            name.lower(): exercise_id
+            for name, exercise_id in session.execute(select(Exercise.name, Exercise.id))
+        }
+        self.user_ids = {}
+        self.known_user_ids = set()
+        for name, user_id in session.execute(select(User.name, User.id)):
+            self.user_ids.setdefault(name.lower(), user_id)
+            self.known_user_ids.add(user_id)
+
+    def exercise_id(self, name):
+
+        return self.exercise_ids.get(str(name).strip().lower())
+
+    def user_id(self, value, stats):
+
+        value = str(value).strip()
+        if value.isdigit():
+            user_id = int(value)
+            return user_id if user_id in self.known_user_ids else None
+
+        user_id = self.user_ids.get(value.lower())
+        if user_id is None and self.create_users and value:
+            user_id = self.session.execute(
+                insert(User).returning(User.id), [{'name': value}]
+            ).scalar_one()
+            self.user_ids[value.lower()] = user_id
+            self.known_user_ids.add(user_id)
+            stats.users_created += 1
+        return user_id
+
+
+def normalize_records(records, resolver, stats):
+
+    for record in records:
+        stats.rows_read += 1
+
+        if not isinstance(record, dict):
+            stats.skip('invalid values')
+            continue
+
+        user_id = resolver.user_id(record.get('user', ''), stats)
+        if user_id is None:
+            stats.skip('unknown user')
+            continue
+
+        exercise_id = resolver.exercise_id(record.get('exercise', ''))
+        if exercise_id is None:
+            stats.skip('unknown exercise')
+            continue
+
+        try:
+            workout_date = datetime.strptime(str(record['date']).strip(), '%Y-%m-%d').date()
+            sets = int(record['sets'])
+            reps = int(record['reps'])
+            weight = float(record['weight'])
+        except (KeyError, TypeError, ValueError):
+            stats.skip('invalid values')
+            continue
+
+        # float() also reads spreadsheet 'NaN' and 'inf' cells.
+        if sets < 1 or reps < 1 or not math.isfinite(weight) or weight < 0:
+            stats.skip('invalid values')
+            continue
+
+        yield {
+            'user_id': user_id,
+            'workout_date': workout_date,
+            'exercise_id': exercise_id,
+            'sets': sets,
+            'reps': reps,
+            'weight': weight,
+            'notes': record.get('notes') or None,
+            'workout_notes': record.get('workout_notes') or None,
+        }
+
+
+def flush_chunk(session, workouts, stats):
+
+    workout_ids = session.scalars(
+        insert(Workout).returning(Workout.id, sort_by_parameter_order=True),
+        [
+            {'user_id': user_id, 'workout_date': workout_date, 'notes': notes}
+            for user_id, workout_date, notes, _ in workouts
+        ]
+    ).all()
+
+    session.execute(insert(WorkoutExercise.__table__), [
+        {
+            'workout_id': workout_id,
+            'exercise_id': entry['exercise_id'],
+            'sets': entry['sets'],
+            'reps': entry['reps'],
+            'weight': entry['weight'],
+            'notes': entry['notes'],
+        }
+        for workout_id, (_, _, _, entries) in zip(workout_ids, workouts)
+        for entry in entries
+    ])
+
+    apply_workouts(session, [
+        (user_id, workout_date, [(e['exercise_id'], e['sets'], e['reps'], e['weight']) for e in entries])
+        for user_id, workout_date, _, entries in workouts
+    ])
+    session.commit()
+
+    stats.workouts_created += len(workouts)
+    stats.rows_imported += sum(len(entries) for *_, entries in workouts)
+
+
+def import_workouts(session, stream, file_format='csv', chunk_size=DEFAULT_CHUNK_SIZE,
+                    create_users=False, progress=None):
+
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format '{file_format}'")
+
+    stats = ImportStats()
+    resolver = NameResolver(session, create_users=create_users)
+    rows = normalize_records(read_records(stream, file_format), resolver, stats)
+
+    chunk = []
+    chunk_rows = 0
+
+    try:
+        for (user_id, workout_date), group in groupby(rows, key=lambda r: (r['user_id'], r['workout_date'])):
+            entries = list(group)
+            chunk.append((user_id, workout_date, entries[0]['workout_notes'], entries))
+            chunk_rows += len(entries)
+
+            if chunk_rows >= chunk_size:
+                flush_chunk(session, chunk, stats)
+                chunk = []
+                chunk_rows = 0
+                if progress:
+                    progress(stats)
+
+        if chunk:
+            flush_chunk(session, chunk, stats)
+        else:
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    if progress:
+        progress(stats)
+
+    return stats
+
+
+def print_progress(stats):
+
+    print(
+        f"\r  Imported {stats.rows_imported:,} rows into {stats.workouts_created:,} workouts"
+        f" ({stats.rows_skipped:,} skipped)",
+        end='', flush=True
+    )
+
+
+if __name__ == "__main__":
+
+    from lib.database import init_db, get_session
+
+    parser = argparse.ArgumentParser(description="Import workout logs from CSV or JSON Lines")
+    parser.add_argument('path', help="file to import ('-' for stdin)")
+    parser.add_argument('--format', choices=IMPORT_FORMATS, help="defaults to the file extension")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="rows per transaction")
+    parser.add_argument('--create-users', action='store_true', help="create users that don't exist yet")
+    args = parser.parse_args()
+
+    init_db()
+    session = get_session()
+    file_format = args.format or ('csv' if args.path == '-' else detect_format(args.path))
+
+    try:
+        stream = sys.stdin if args.path == '-' else open(args.path, newline='', encoding='utf-8')
+        with stream:
+            stats = import_workouts(
+                session, stream, file_format,
+                chunk_size=args.chunk_size,
+                create_users=args.create_users,
+                progress=print_progress
+            )
+        print(f"\n Import complete: {stats.rows_imported:,} of {stats.rows_read:,} rows imported")
+        if stats.users_created:
+            print(f" Created {stats.users_created} new users")
+        for reason, count in stats.skipped.items():
+            print(f" Skipped {count:,} rows: {reason}")
+    except Exception as e:
+        print(f"\nError during import: {e}")
+        sys.exit(1)
+    finally:
+        session.close()
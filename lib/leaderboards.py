@@ -0,0 +1,216 @@
+import os
+import time
+from datetime import date, timedelta
+from sqlalchemy import select, func, distinct, case, cast, Integer
+from lib.models import User, Workout, WorkoutExercise, Exercise, PersonalRecord
+from lib.aggregates import period_start, period_start_column
+
+# Gym-wide leaderboards. Every board is one SQL statement that groups and
+# ranks rows with window functions, so no user's object graph is loaded.
+# Results are cached per database for LEADERBOARD_TTL seconds; boards are
+# read far more often than they change, and a few minutes of staleness is
+# fine for a ranking.
+
+LEADERBOARD_TTL = float(os.environ.get("FITNESS_TRACKER_LEADERBOARD_TTL", "300"))
+LEADERBOARD_SIZE = 10
+
+week_start = period_start_column('week', Workout.workout_date)
+
+
+class LeaderboardCache:
+
+    def __init__(self, ttl=LEADERBOARD_TTL, clock=time.monotonic):
+
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = {}
+
+    def get(self, key, compute):
+
+        now = self.clock()
+        entry = self.entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+
+        value = compute()
+        self.entries[key] = (now, value)
+        return value
+
+    def invalidate(self):
+
+        self.entries.clear()
+
+
+leaderboard_cache = LeaderboardCache()
+
+
+def cached(session, name, compute, *args):
+
+    key = (str(session.get_bind().url), name) + args
+    return leaderboard_cache.get(key, compute)
+
+
+def weekly_volume_query(since, limit=LEADERBOARD_SIZE):
+
+    volume = func.sum(WorkoutExercise.sets * WorkoutExercise.reps * WorkoutExercise.weight)
+
+    weekly = (
+        select(
+            Workout.user_id,
+            week_start.label('week_start'),
+            volume.label('total_volume'),
+            func.count(distinct(Workout.id)).label('workouts')
+        )
+        .join(WorkoutExercise, WorkoutExercise.workout_id == Workout.id)
+        .where(Workout.workout_date >= since)
+        .group_by(Workout.user_id, week_start)
+        .subquery()
+    )
+
+    ranked = (
+        select(
+            weekly,
+            User.name,
+            func.rank().over(
+                partition_by=weekly.c.week_start,
+                order_by=weekly.c.total_volume.desc()
+            ).label('rank')
+        )
+        .join(User, User.id == weekly.c.user_id)
+        .subquery()
+    )
+
+    return (
+        select(ranked)
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.week_start.desc(), ranked.c.rank, ranked.c.name)
+    )
+
+
+def get_weekly_volume_leaderboard(session, weeks=1, limit=LEADERBOARD_SIZE, today=None):
+    # Top `limit` users by volume for each of the last `weeks` weeks,
+    # counting the current one.
+
+    since = period_start('week', today or date.today()) - timedelta(weeks=weeks - 1)
+    return cached(
+        session, 'weekly_volume',
+        lambda: session.execute(weekly_volume_query(since, limit)).all(),
+        since, limit
+    )
+
+
+def exercise_record_query(exercise_id=None, limit=LEADERBOARD_SIZE):
+    # Per exercise, users ranked by heaviest weight lifted, ties broken by
+    # estimated 1RM. Reads the personal_records index rather than scanning
+    # every logged set.
+
+    ranked = (
+        select(
+            PersonalRecord.exercise_id,
+            Exercise.name.label('exercise_name'),
+            User.name,
+            PersonalRecord.max_weight,
+            PersonalRecord.reps_at_max_weight,
+            PersonalRecord.estimated_one_rep_max,
+            func.rank().over(
+                partition_by=PersonalRecord.exercise_id,
+                order_by=(PersonalRecord.max_weight.desc(), PersonalRecord.estimated_one_rep_max.desc())
+            ).label('rank')
+        )
+        .join(Exercise, Exercise.id == PersonalRecord.exercise_id)
+        .join(User, User.id == PersonalRecord.user_id)
+    )
+    if exercise_id is not None:
+        ranked = ranked.where(PersonalRecord.exercise_id == exercise_id)
+    ranked = ranked.subquery()
+
+    return (
+        select(ranked)
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.exercise_name, ranked.c.rank, ranked.c.name)
+    )
+
+
+def get_exercise_record_leaderboard(session, exercise_id=None, limit=LEADERBOARD_SIZE):
+
+    return cached(
+        session, 'exercise_records',
+        lambda: session.execute(exercise_record_query(exercise_id, limit)).all(),
+        exercise_id, limit
+    )
+
+
+def streak_query(current_week, limit=LEADERBOARD_SIZE):
+    # Consecutive training weeks per user (gaps and islands): number the
+    # distinct weeks each user trained in; within a run of consecutive weeks
+    # week number minus row number is constant, so it identifies the run.
+
+    week_number = cast((func.julianday(Workout.workout_date) - func.julianday('1970-01-05')) / 7, Integer)
+
+    weeks = (
+        select(Workout.user_id, week_number.label('week'))
+        .group_by(Workout.user_id, week_number)
+        .subquery()
+    )
+
+    islands = (
+        select(
+            weeks.c.user_id,
+            weeks.c.week,
+            (weeks.c.week - func.row_number().over(
+                partition_by=weeks.c.user_id,
+                order_by=weeks.c.week
+            )).label('island')
+        )
+        .subquery()
+    )
+
+    runs = (
+        select(
+            islands.c.user_id,
+            func.count().label('length'),
+            func.max(islands.c.week).label('last_week')
+        )
+        .group_by(islands.c.user_id, islands.c.island)
+        .subquery()
+    )
+
+    # A run is still going if the user trained this week or last week.
+    streaks = (
+        select(
+            runs.c.user_id,
+            func.max(runs.c.length).label('longest_streak'),
+            func.max(case((runs.c.last_week >= current_week - 1, runs.c.length), else_=0)).label('current_streak')
+        )
+        .group_by(runs.c.user_id)
+        .subquery()
+    )
+
+    ranked = (
+        select(
+            streaks,
+            User.name,
+            func.rank().over(
+                order_by=(streaks.c.current_streak.desc(), streaks.c.longest_streak.desc())
+            ).label('rank')
+        )
+        .join(User, User.id == streaks.c.user_id)
+        .subquery()
+    )
+
+    return (
+        select(ranked)
+        .where(ranked.c.rank <= limit)
+        .order_by(ranked.c.rank, ranked.c.name)
+    )
+
+
+def get_streak_leaderboard(session, limit=LEADERBOARD_SIZE, today=None):
+    # Weeks are counted Monday to Sunday; 1970-01-05 was a Monday.
+
+    current_week = (period_start('week', today or date.today()) - date(1970, 1, 5)).days // 7
+    return cached(
+        session, 'streaks',
+        lambda: session.execute(streak_query(current_week, limit)).all(),
+        current_week, limit
+    )
@@ -1,8 +1,9 @@
 
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import select, Index, Column, Integer, String, Float, Date, DateTime, Boolean, ForeignKey, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from lib.database import Base
+from lib.search import search_index_available, build_match_query, apply_search
 
 class User(Base):
     
@@ -18,6 +19,7 @@ class User(Base):
     
   
     workouts = relationship('Workout', back_populates='user', cascade='all, delete-orphan')
+    stats = relationship('UserStats', back_populates='user', uselist=False, cascade='all, delete-orphan')
     
     def __repr__(self):
 
@@ -29,10 +31,14 @@ class User(Base):
     
     def get_workout_count(self):
        
+        if self.stats is not None:
+            return self.stats.workout_count
         return len(self.workouts)
     
     def get_total_exercises_logged(self):
      
+        if self.stats is not None:
+            return self.stats.exercise_count
         total = 0
         for workout in self.workouts:
             total += len(workout.workout_exercises)
@@ -41,6 +47,9 @@ class User(Base):
 class Workout(Base):
    
     __tablename__ = 'workouts'
+    __table_args__ = (
+        Index('ix_workouts_user_id_workout_date', 'user_id', 'workout_date'),
+    )
 
     id = Column(Integer, primary_key=True)
     
@@ -84,6 +93,9 @@ class Workout(Base):
 class Exercise(Base):
 
     __tablename__ = 'exercises'
+    __table_args__ = (
+        Index('ix_exercises_muscle_group', 'muscle_group'),
+    )
     
     id = Column(Integer, primary_key=True)
     
@@ -94,6 +106,9 @@ class Exercise(Base):
     description = Column(Text, nullable=True)  
     is_custom = Column(Boolean, default=False)  
     created_at = Column(DateTime, default=datetime.now)
+    # Times the exercise has been logged by anyone, maintained by
+    # lib.aggregates; per-user counts are in exercise_usage.
+    usage_count = Column(Integer, nullable=False, default=0, server_default='0')
     
     
     workout_exercises = relationship('WorkoutExercise', back_populates='exercise')
@@ -104,6 +119,13 @@ class Exercise(Base):
     @classmethod
     def search_by_name(cls, session, search_term):
         
+        if search_index_available(session) and build_match_query(search_term):
+            results = session.scalars(
+                apply_search(select(cls), cls, search_term)
+            ).all()
+            if results:
+                return results
+        
         return session.query(cls).filter(
             cls.name.ilike(f"%{search_term}%")
         ).all()
@@ -115,14 +137,28 @@ class Exercise(Base):
             cls.muscle_group == muscle_group
         ).all()
     
+    @classmethod
+    def most_popular(cls, session, limit=None, muscle_group=None):
+
+        query = select(cls).order_by(cls.usage_count.desc(), cls.name)
+        if muscle_group:
+            query = query.where(cls.muscle_group == muscle_group)
+        if limit:
+            query = query.limit(limit)
+        return session.scalars(query).all()
+    
     def get_usage_count(self):
         
-        return len(self.workout_exercises)
+        return self.usage_count
 
 
 class WorkoutExercise(Base):
     
     __tablename__ = 'workout_exercises'
+    __table_args__ = (
+        Index('ix_workout_exercises_workout_id', 'workout_id'),
+        Index('ix_workout_exercises_exercise_id_workout_id', 'exercise_id', 'workout_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     
@@ -152,12 +188,92 @@ class WorkoutExercise(Base):
         return self.exercise.name if self.exercise else "Unknown"
 
 
+class UserStats(Base):
+    # Running totals per user, maintained by lib.aggregates whenever a
+    # workout is logged so headers and statistics don't rescan history.
 
+    __tablename__ = 'user_stats'
 
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+
+    workout_count = Column(Integer, nullable=False, default=0)
+    exercise_count = Column(Integer, nullable=False, default=0)
+    total_volume = Column(Float, nullable=False, default=0.0)
+    first_workout_date = Column(Date, nullable=True)
+    last_workout_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    user = relationship('User', back_populates='stats')
+
+    def __repr__(self):
 
+        return f"<UserStats(user_id={self.user_id}, workouts={self.workout_count}, volume={self.total_volume})>"
 
 
+class PersonalRecord(Base):
+    # Best lifts per user and exercise, maintained by lib.aggregates as
+    # exercises are logged.
 
+    __tablename__ = 'personal_records'
+
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    exercise_id = Column(Integer, ForeignKey('exercises.id'), primary_key=True)
+
+    max_weight = Column(Float, nullable=False, default=0.0)
+    reps_at_max_weight = Column(Integer, nullable=False, default=0)
+    max_set_volume = Column(Float, nullable=False, default=0.0)
+    estimated_one_rep_max = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    exercise = relationship('Exercise')
+
+    def __repr__(self):
+
+        return (
+            f"<PersonalRecord(user_id={self.user_id}, exercise_id={self.exercise_id}, "
+            f"{self.max_weight}lbs x {self.reps_at_max_weight})>"
+        )
 
 
+class TrainingRollup(Base):
+    # Volume, sets and reps per user, muscle group and calendar period
+    # ('day', 'week' starting Monday, 'month'), maintained by lib.aggregates
+    # so trend screens read one row per period instead of every set.
+
+    __tablename__ = 'training_rollups'
+
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    period = Column(String(5), primary_key=True)
+    period_start = Column(Date, primary_key=True)
+    muscle_group = Column(String(50), primary_key=True)
+
+    total_volume = Column(Float, nullable=False, default=0.0)
+    total_sets = Column(Integer, nullable=False, default=0)
+    total_reps = Column(Integer, nullable=False, default=0)
+    exercise_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+
+        return (
+            f"<TrainingRollup(user_id={self.user_id}, {self.period} of {self.period_start}, "
+            f"{self.muscle_group}, volume={self.total_volume})>"
+        )
+
+
+class ExerciseUsage(Base):
+    # How many times each user has logged each exercise, maintained by
+    # lib.aggregates alongside Exercise.usage_count.
+
+    __tablename__ = 'exercise_usage'
+    __table_args__ = (
+        Index('ix_exercise_usage_exercise_id', 'exercise_id'),
+    )
+
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    exercise_id = Column(Integer, ForeignKey('exercises.id'), primary_key=True)
+
+    usage_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
 
+        return f"<ExerciseUsage(user_id={self.user_id}, exercise_id={self.exercise_id}, count={self.usage_count})>"
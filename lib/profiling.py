@@ -0,0 +1,177 @@
+import atexit
+import heapq
+import json
+import re
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from sqlalchemy import event
+
+# Opt-in query profiling per CLI action. Set FITNESS_TRACKER_PROFILE to
+# print a summary when the program exits, or to a path ending in .json to
+# write the summary there instead:
+#
+#   FITNESS_TRACKER_PROFILE=1 python -m lib.cli
+#   FITNESS_TRACKER_PROFILE=profile.json python -m lib.cli stats
+#
+# Every statement is charged to the innermost action running when it
+# executes (menu entries and scripted commands are actions). Statements
+# issued outside any action, like startup and the menu header, are charged
+# to "(other)".
+
+SLOWEST_STATEMENTS = 5
+OTHER_ACTION = "(other)"
+
+
+def compact_statement(statement, limit=200):
+
+    statement = re.sub(r'\s+', ' ', statement).strip()
+    return statement if len(statement) <= limit else statement[:limit - 3] + '...'
+
+
+@dataclass
+class ActionProfile:
+
+    name: str
+    calls: int = 0
+    wall_time: float = 0.0
+    statements: int = 0
+    db_time: float = 0.0
+    lazy_loads: dict = field(default_factory=dict)
+    slowest: list = field(default_factory=list)
+
+    def record_statement(self, statement, elapsed):
+
+        self.statements += 1
+        self.db_time += elapsed
+        entry = (elapsed, self.statements, statement)
+        if len(self.slowest) < SLOWEST_STATEMENTS:
+            heapq.heappush(self.slowest, entry)
+        elif elapsed > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def to_dict(self):
+
+        return {
+            'action': self.name,
+            'calls': self.calls,
+            'wall_ms': round(self.wall_time * 1000, 3),
+            'statements': self.statements,
+            'db_ms': round(self.db_time * 1000, 3),
+            'lazy_loads': dict(sorted(self.lazy_loads.items(), key=lambda item: -item[1])),
+            'slowest': [
+                {'ms': round(elapsed * 1000, 3), 'statement': compact_statement(statement)}
+                for elapsed, _, statement in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+
+class QueryProfiler:
+
+    def __init__(self):
+
+        self.enabled = False
+        self.actions = {}
+        self.stack = []
+
+    def profile(self, name):
+
+        profile = self.actions.get(name)
+        if profile is None:
+            self.actions[name] = profile = ActionProfile(name)
+        return profile
+
+    def current(self):
+
+        return self.profile(self.stack[-1] if self.stack else OTHER_ACTION)
+
+    @contextmanager
+    def action(self, name):
+
+        if not self.enabled:
+            yield
+            return
+
+        profile = self.profile(name)
+        profile.calls += 1
+        self.stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            profile.wall_time += time.perf_counter() - start
+            self.stack.pop()
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+
+        conn.info.setdefault('profile_query_start', []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+
+        elapsed = time.perf_counter() - conn.info['profile_query_start'].pop()
+        self.current().record_statement(statement, elapsed)
+
+    def do_orm_execute(self, orm_execute_state):
+        # lazy_loaded_from is only set for lazy loads, not for selectin or
+        # joined eager loads, which are planned rather than accidental.
+
+        if orm_execute_state.lazy_loaded_from is None:
+            return
+        path = orm_execute_state.loader_strategy_path
+        relationship = str(path.prop) if path is not None and hasattr(path, 'prop') else 'unknown'
+        lazy_loads = self.current().lazy_loads
+        lazy_loads[relationship] = lazy_loads.get(relationship, 0) + 1
+
+    def install(self, engine, session_factory, output=None):
+
+        self.enabled = True
+        event.listen(engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self.after_cursor_execute)
+        event.listen(session_factory, 'do_orm_execute', self.do_orm_execute)
+
+        if output and output.lower().endswith('.json'):
+            atexit.register(self.dump_json, output)
+        else:
+            atexit.register(self.print_summary)
+
+    def report(self):
+
+        actions = sorted(self.actions.values(), key=lambda profile: -profile.db_time)
+        return {'actions': [profile.to_dict() for profile in actions]}
+
+    def dump_json(self, path):
+
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"Query profile written to {path}", file=sys.stderr)
+
+    def print_summary(self, file=None):
+
+        file = file or sys.stderr
+        actions = self.report()['actions']
+        if not actions:
+            return
+
+        print("\n" + "=" * 78, file=file)
+        print("  QUERY PROFILE", file=file)
+        print("=" * 78, file=file)
+        print(f"  {'Action':<28} {'Calls':>5} {'Stmts':>6} {'DB ms':>9} {'Wall ms':>9} {'Lazy':>5}", file=file)
+        for action in actions:
+            print(
+                f"  {action['action']:<28} {action['calls']:>5} {action['statements']:>6}"
+                f" {action['db_ms']:>9.1f} {action['wall_ms']:>9.1f} {sum(action['lazy_loads'].values()):>5}",
+                file=file
+            )
+
+        for action in actions:
+            if not action['statements']:
+                continue
+            print(f"\n  {action['action']}", file=file)
+            for relationship, count in action['lazy_loads'].items():
+                print(f"    lazy load x{count}: {relationship}", file=file)
+            for slow in action['slowest']:
+                print(f"    {slow['ms']:>8.2f} ms  {slow['statement']}", file=file)
+
+
+profiler = QueryProfiler()
@@ -0,0 +1,189 @@
+from dataclasses import dataclass, field
+from itertools import groupby
+from sqlalchemy import select, func
+from lib.models import Workout, WorkoutExercise
+from lib.helpers import calculate_one_rep_max
+
+# Strength progression per exercise. A user's whole history is read as
+# (exercise, date, sets, reps, weight) rows sorted by exercise and date and
+# folded in one pass: each session gets Epley and Brzycki 1RM estimates,
+# each exercise a least-squares trend and a plateau flag.
+#
+# Results are cached per user and reused until the user's latest workout
+# id or workout count changes, i.e. until a workout is logged or deleted.
+
+# Sessions used for the recent trend.
+RECENT_SESSIONS = 6
+# A lift has plateaued when this many sessions in a row haven't raised
+# the best estimate by more than PLATEAU_TOLERANCE.
+PLATEAU_SESSIONS = 4
+PLATEAU_TOLERANCE = 0.01
+
+
+@dataclass
+class SessionEstimate:
+
+    workout_date: object
+    epley: float = 0.0
+    brzycki: float = 0.0
+    top_weight: float = 0.0
+    top_reps: int = 0
+    volume: float = 0.0
+
+
+@dataclass
+class ExerciseProgression:
+
+    exercise_id: int
+    sessions: list = field(default_factory=list)
+    best_estimate: float = 0.0
+    best_date: object = None
+    # Sessions since the best estimate last rose by more than
+    # PLATEAU_TOLERANCE; plateau is based on this alone.
+    stalled_sessions: int = 0
+    trend_per_week: float = 0.0
+    recent_trend_per_week: float = 0.0
+    plateau: bool = False
+
+    @property
+    def latest(self):
+
+        return self.sessions[-1] if self.sessions else None
+
+
+class TrendFit:
+    # Running sums for a least-squares line of estimate against day number.
+
+    def __init__(self):
+
+        self.n = 0
+        self.sum_x = self.sum_y = self.sum_xy = self.sum_xx = 0.0
+
+    def add(self, x, y):
+
+        self.n += 1
+        self.sum_x += x
+        self.sum_y += y
+        self.sum_xy += x * y
+        self.sum_xx += x * x
+
+    def slope(self):
+
+        denominator = self.n * self.sum_xx - self.sum_x ** 2
+        if self.n < 2 or denominator == 0:
+            return 0.0
+        return (self.n * self.sum_xy - self.sum_x * self.sum_y) / denominator
+
+
+def session_estimate(workout_date, entries):
+
+    estimate = SessionEstimate(workout_date)
+    for _, _, sets, reps, weight in entries:
+        estimate.volume += sets * reps * weight
+        epley = calculate_one_rep_max(weight, reps)
+        if epley > estimate.epley:
+            estimate.epley = epley
+            estimate.brzycki = calculate_one_rep_max(weight, reps, formula="brzycki")
+            estimate.top_weight = weight
+            estimate.top_reps = reps
+    return estimate
+
+
+def fit_trend(sessions):
+    # lbs of estimated 1RM gained per week.
+
+    fit = TrendFit()
+    first_day = sessions[0].workout_date.toordinal() if sessions else 0
+    for session in sessions:
+        fit.add(session.workout_date.toordinal() - first_day, session.epley)
+    return fit.slope() * 7
+
+
+def build_progression(exercise_id, rows):
+
+    progression = ExerciseProgression(exercise_id)
+
+    for workout_date, entries in groupby(rows, key=lambda row: row[1]):
+        session = session_estimate(workout_date, entries)
+        progression.sessions.append(session)
+
+        if session.epley > progression.best_estimate * (1 + PLATEAU_TOLERANCE):
+            progression.stalled_sessions = 0
+        else:
+            progression.stalled_sessions += 1
+        if session.epley > progression.best_estimate:
+            progression.best_estimate = session.epley
+            progression.best_date = workout_date
+
+    progression.trend_per_week = fit_trend(progression.sessions)
+    progression.recent_trend_per_week = fit_trend(progression.sessions[-RECENT_SESSIONS:])
+    progression.plateau = progression.stalled_sessions >= PLATEAU_SESSIONS
+    return progression
+
+
+def progression_rows_query(user_id):
+
+    return (
+        select(
+            WorkoutExercise.exercise_id,
+            Workout.workout_date,
+            WorkoutExercise.sets,
+            WorkoutExercise.reps,
+            WorkoutExercise.weight
+        )
+        .join(Workout, WorkoutExercise.workout_id == Workout.id)
+        .where(Workout.user_id == user_id)
+        .order_by(WorkoutExercise.exercise_id, Workout.workout_date)
+    )
+
+
+def compute_progressions(session, user_id):
+
+    rows = session.execute(progression_rows_query(user_id))
+    progressions = {}
+    for exercise_id, entries in groupby(rows, key=lambda row: row[0]):
+        progression = build_progression(exercise_id, entries)
+        # Zero-load lifts (push-ups, running) have no 1RM to progress.
+        if progression.best_estimate > 0:
+            progressions[exercise_id] = progression
+    return progressions
+
+
+class ProgressionCache:
+
+    def __init__(self):
+
+        self.entries = {}
+
+    def get(self, session, user_id):
+
+        version = tuple(session.execute(
+            select(func.max(Workout.id), func.count(Workout.id)).where(Workout.user_id == user_id)
+        ).one())
+        key = (str(session.get_bind().url), user_id)
+
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        progressions = compute_progressions(session, user_id)
+        self.entries[key] = (version, progressions)
+        return progressions
+
+    def invalidate(self):
+
+        self.entries.clear()
+
+
+progression_cache = ProgressionCache()
+
+
+def get_user_progressions(session, user_id):
+    # {exercise_id: ExerciseProgression} for every exercise the user logged.
+
+    return progression_cache.get(session, user_id)
+
+
+def get_exercise_progression(session, user_id, exercise_id):
+
+    return get_user_progressions(session, user_id).get(exercise_id)
@@ -0,0 +1,115 @@
+import re
+from sqlalchemy import text, table, column, literal_column, func
+
+SEARCH_TABLE = 'exercises_fts'
+
+# Column weights for bm25(): a hit in the name outranks equipment,
+# which outranks the free-text description.
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+EQUIPMENT_WEIGHT = 2.0
+
+exercises_fts = table(SEARCH_TABLE, column('rowid'))
+
+# Only changes to indexed columns touch the index; usage_count is bumped
+# on every logged workout.
+UPDATE_TRIGGER = f"""
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_update
+    AFTER UPDATE OF name, description, equipment_needed ON exercises BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description, equipment_needed)
+        VALUES ('delete', old.id, old.name, old.description, old.equipment_needed);
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description, equipment_needed)
+        VALUES (new.id, new.name, new.description, new.equipment_needed);
+    END
+"""
+
+_CREATE_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+        name, description, equipment_needed,
+        content='exercises', content_rowid='id',
+        prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_insert AFTER INSERT ON exercises BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description, equipment_needed)
+        VALUES (new.id, new.name, new.description, new.equipment_needed);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_delete AFTER DELETE ON exercises BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description, equipment_needed)
+        VALUES ('delete', old.id, old.name, old.description, old.equipment_needed);
+    END
+    """,
+    UPDATE_TRIGGER,
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')",
+)
+
+_index_available = {}
+
+
+def fts5_supported(connection):
+
+    options = connection.execute(text("PRAGMA compile_options")).scalars().all()
+    return 'ENABLE_FTS5' in options
+
+
+def search_index_exists(connection):
+
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': SEARCH_TABLE}
+    ).first() is not None
+
+
+def install_search_index(connection):
+
+    if connection.dialect.name != 'sqlite' or not fts5_supported(connection):
+        _index_available[connection.engine.url] = False
+        return False
+
+    if not search_index_exists(connection):
+        for statement in _CREATE_STATEMENTS:
+            connection.execute(text(statement))
+    else:
+        # Older databases have an update trigger that fires on any column.
+        connection.execute(text("DROP TRIGGER IF EXISTS exercises_fts_update"))
+        connection.execute(text(UPDATE_TRIGGER))
+
+    _index_available[connection.engine.url] = True
+    return True
+
+
+def search_index_available(session):
+
+    bind = session.get_bind()
+    if bind.url not in _index_available:
+        _index_available[bind.url] = (
+            bind.dialect.name == 'sqlite' and search_index_exists(session.connection())
+        )
+    return _index_available[bind.url]
+
+
+def build_match_query(search_term):
+    # Every word becomes a quoted prefix query, so "ben pre" matches
+    # "Bench Press" and punctuation in user input can't break FTS syntax.
+
+    words = re.findall(r"\w+", search_term.lower())
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def apply_search(statement, model, search_term):
+
+    match_query = build_match_query(search_term)
+    rank = func.bm25(
+        literal_column(SEARCH_TABLE), NAME_WEIGHT, DESCRIPTION_WEIGHT, EQUIPMENT_WEIGHT
+    )
+
+    return (
+        statement
+        .join(exercises_fts, exercises_fts.c.rowid == model.id)
+        .where(literal_column(SEARCH_TABLE).op('MATCH')(match_query))
+        .order_by(rank, model.name)
+    )
@@ -1,7 +1,11 @@
 
 
+import argparse
+import random
+from sqlalchemy import insert, select, func
 from lib.database import get_session, init_db
 from lib.models import Exercise, User, Workout, WorkoutExercise  
+from lib.aggregates import apply_workout, workout_entries, rebuild_all
 from datetime import date, timedelta
 
 MUSCLE_GROUPS = ('Chest', 'Back', 'Legs', 'Shoulders', 'Arms', 'Core', 'Cardio')  
@@ -63,6 +67,21 @@ EXERCISE_DATA = {
     ],
 }
 
+def exercise_rows():
+
+    return [
+        {
+            'name': exercise_dict['name'],
+            'muscle_group': muscle_group,
+            'equipment_needed': exercise_dict['equipment'],
+            'description': exercise_dict['description'],
+            'is_custom': False
+        }
+        for muscle_group, exercises_list in EXERCISE_DATA.items()
+        for exercise_dict in exercises_list
+    ]
+
+
 def seed_exercises(session):
     
     existing_count = session.query(Exercise).count()
@@ -72,23 +91,18 @@ def seed_exercises(session):
     
     print("Seeding exercise library...")
     
-    total_exercises = 0  
-    
+    rows = exercise_rows()
+    session.execute(insert(Exercise), rows)
+    session.commit()
+    print(f" Seeded {len(rows)} exercises across {len(MUSCLE_GROUPS)} muscle groups")
 
-    for muscle_group, exercises_list in EXERCISE_DATA.items():
-        for exercise_dict in exercises_list:
-            exercise = Exercise(
-                name=exercise_dict['name'],
-                muscle_group=muscle_group,
-                equipment_needed=exercise_dict['equipment'],
-                description=exercise_dict['description'],
-                is_custom=False 
-            )
-            session.add(exercise)
-            total_exercises += 1
 
-    session.commit()
-    print(f" Seeded {total_exercises} exercises across {len(MUSCLE_GROUPS)} muscle groups")
+def get_exercise_ids(session, names=None):
+
+    query = select(Exercise.name, Exercise.id)
+    if names is not None:
+        query = query.where(Exercise.name.in_(names))
+    return dict(session.execute(query).all())
 
 
 def seed_sample_user_custom_name(session):
@@ -103,6 +117,12 @@ def seed_sample_user_custom_name(session):
         print(f" User '{custom_name}' already exists")
         return
     
+    exercise_ids = get_exercise_ids(session, ["Bench Press", "Squat", "Deadlift"])
+    
+    if len(exercise_ids) < 3:
+        print("! Could not create demo workouts - exercises not found")
+        return
+    
     print(f"Creating sample user '{custom_name}' with demo workouts...")
 
     demo_user = User(
@@ -112,65 +132,126 @@ def seed_sample_user_custom_name(session):
         fitness_goal=custom_goal
     )
     session.add(demo_user)
-    session.commit()
-
-    bench_press = session.query(Exercise).filter_by(name="Bench Press").first()
-    squat = session.query(Exercise).filter_by(name="Squat").first()
-    deadlift = session.query(Exercise).filter_by(name="Deadlift").first()
-    
-    if not (bench_press and squat and deadlift):
-        print("! Could not create demo workouts - exercises not found")
-        return
-    
 
     workout1 = Workout(
         user=demo_user,
         workout_date=date.today() - timedelta(days=3),
         notes="Great chest day! Felt really strong on bench press."
     )
-    session.add(workout1)
-
-    we1 = WorkoutExercise(
-        workout=workout1,
-        exercise=bench_press,
+    workout1.workout_exercises.append(WorkoutExercise(
+        exercise_id=exercise_ids["Bench Press"],
         sets=3,
         reps=10,
         weight=135.0,
         notes="Added 5 lbs from last session"
-    )
-    session.add(we1)
-    
+    ))
     
     workout2 = Workout(
         user=demo_user,
         workout_date=date.today() - timedelta(days=1),
         notes="Leg day - tough but productive"
     )
-    session.add(workout2)
-    
-    we2 = WorkoutExercise(
-        workout=workout2,
-        exercise=squat,
-        sets=4,
-        reps=8,
-        weight=225.0,
-        notes="New PR!"
-    )
-    we3 = WorkoutExercise(
-        workout=workout2,
-        exercise=deadlift,
-        sets=3,
-        reps=5,
-        weight=275.0,
-        notes="Form felt solid"
-    )
-    session.add(we2)
-    session.add(we3)
+    workout2.workout_exercises.extend([
+        WorkoutExercise(
+            exercise_id=exercise_ids["Squat"],
+            sets=4,
+            reps=8,
+            weight=225.0,
+            notes="New PR!"
+        ),
+        WorkoutExercise(
+            exercise_id=exercise_ids["Deadlift"],
+            sets=3,
+            reps=5,
+            weight=275.0,
+            notes="Form felt solid"
+        )
+    ])
+    session.add_all([workout1, workout2])
+    session.flush()
+    
+    for workout in (workout1, workout2):
+        apply_workout(session, demo_user.id, workout.workout_date, workout_entries(workout.workout_exercises))
     
     session.commit()
     print(f" Created user '{demo_user.name}' with 2 sample workouts")
 
 
+def generate_synthetic_data(session, users=100, workouts_per_user=100, exercises_per_workout=5,
+                            seed=42, start_date=date(2020, 1, 1), chunk_size=50000):
+    # Deterministic load-testing data: the same arguments always produce the
+    # same rows. Ids are assigned up front so workouts and their exercises can
+    # be written with plain executemany inserts in a single transaction.
+
+    rng = random.Random(seed)
+
+    if not session.query(Exercise).count():
+        session.execute(insert(Exercise), exercise_rows())
+    exercise_ids = list(get_exercise_ids(session).values())
+
+    next_user_id = (session.scalar(select(func.max(User.id))) or 0) + 1
+    next_workout_id = (session.scalar(select(func.max(Workout.id))) or 0) + 1
+
+    user_ids = list(range(next_user_id, next_user_id + users))
+    session.execute(insert(User.__table__), [
+        {
+            'id': user_id,
+            'name': f"Synthetic User {user_id}",
+            'age': rng.randint(18, 65),
+            'weight': float(rng.randint(110, 260)),
+            'fitness_goal': 'Load testing'
+        }
+        for user_id in user_ids
+    ])
+
+    workout_rows = []
+    exercise_rows_buffer = []
+    workout_id = next_workout_id
+    total_workout_exercises = 0
+
+    for user_id in user_ids:
+        workout_date = start_date
+        for _ in range(workouts_per_user):
+            workout_date += timedelta(days=rng.randint(1, 3))
+            workout_rows.append({
+                'id': workout_id,
+                'user_id': user_id,
+                'workout_date': workout_date
+            })
+
+            for exercise_id in rng.sample(exercise_ids, min(exercises_per_workout, len(exercise_ids))):
+                exercise_rows_buffer.append({
+                    'workout_id': workout_id,
+                    'exercise_id': exercise_id,
+                    'sets': rng.randint(1, 5),
+                    'reps': rng.randint(3, 15),
+                    'weight': float(rng.randrange(5, 405, 5))
+                })
+            workout_id += 1
+
+            if len(exercise_rows_buffer) >= chunk_size:
+                session.execute(insert(Workout.__table__), workout_rows)
+                session.execute(insert(WorkoutExercise.__table__), exercise_rows_buffer)
+                total_workout_exercises += len(exercise_rows_buffer)
+                workout_rows = []
+                exercise_rows_buffer = []
+
+    if workout_rows:
+        session.execute(insert(Workout.__table__), workout_rows)
+    if exercise_rows_buffer:
+        session.execute(insert(WorkoutExercise.__table__), exercise_rows_buffer)
+        total_workout_exercises += len(exercise_rows_buffer)
+
+    rebuild_all(session, user_ids)
+    session.commit()
+
+    return {
+        'users': users,
+        'workouts': workout_id - next_workout_id,
+        'workout_exercises': total_workout_exercises
+    }
+
+
 def seed_multiple_demo_users(session):
    
     demo_users_data = [
@@ -246,5 +327,46 @@ def seed_database():
     finally:
         session.close()
 
+def seed_synthetic_database(users, workouts_per_user, exercises_per_workout, seed):
+
+    init_db()
+
+    session = get_session()
+
+    try:
+        print(
+            f"Generating {users} users x {workouts_per_user} workouts x "
+            f"{exercises_per_workout} exercises (seed {seed})..."
+        )
+        counts = generate_synthetic_data(
+            session,
+            users=users,
+            workouts_per_user=workouts_per_user,
+            exercises_per_workout=exercises_per_workout,
+            seed=seed
+        )
+        print(
+            f" Created {counts['users']} users, {counts['workouts']} workouts and "
+            f"{counts['workout_exercises']} workout exercises"
+        )
+    except Exception as e:
+        print(f"Error during seeding: {e}")
+        session.rollback()
+    finally:
+        session.close()
+
+
 if __name__ == "__main__":
-    seed_database()
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="Seed the fitness tracker database")
+    parser.add_argument('--synthetic', action='store_true', help="generate a large synthetic dataset")
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--workouts', type=int, default=100, help="workouts per user")
+    parser.add_argument('--exercises', type=int, default=5, help="exercises per workout")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        seed_synthetic_database(args.users, args.workouts, args.exercises, args.seed)
+    else:
+        seed_database()
\ No newline at end of file
@@ -0,0 +1,281 @@
+import math
+from datetime import date, datetime
+from sqlalchemy import select, func
+from lib.models import User, UserStats, Exercise, Workout
+from lib.history import HISTORY_PAGE_SIZE, get_workout_page, workout_cursor
+from lib.statistics import get_user_statistics, get_exercise_usage, get_most_used_exercises
+from lib.workout_draft import WorkoutDraft
+from lib.aggregates import workout_entries, retract_workouts
+
+# Interface-neutral operations behind the menu, the scripted commands and
+# the HTTP API. Each takes a session, validates its arguments and returns
+# plain dicts and lists that can be printed or serialized as JSON. Bad
+# input raises ServiceError; a user that doesn't exist raises NotFound.
+
+MAX_PAGE_SIZE = 100
+
+
+class ServiceError(Exception):
+    pass
+
+
+class NotFound(ServiceError):
+    pass
+
+
+def parse_date(value):
+
+    if value is None or isinstance(value, date):
+        return value or date.today()
+    if str(value).lower() == 'today':
+        return date.today()
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d').date()
+    except ValueError:
+        raise ServiceError(f"invalid date '{value}' (use YYYY-MM-DD or 'today')")
+
+
+def format_cursor(cursor):
+
+    workout_date, workout_id = cursor
+    return f"{workout_date.isoformat()}:{workout_id}"
+
+
+def parse_cursor(value):
+
+    if value is None:
+        return None
+    try:
+        workout_date, workout_id = str(value).split(':')
+        return (datetime.strptime(workout_date, '%Y-%m-%d').date(), int(workout_id))
+    except ValueError:
+        raise ServiceError(f"invalid cursor '{value}'")
+
+
+def user_record(user, stats=None):
+
+    return {
+        'id': user.id,
+        'name': user.name,
+        'age': user.age,
+        'weight': user.weight,
+        'fitness_goal': user.fitness_goal,
+        'total_workouts': stats.workout_count if stats else 0,
+    }
+
+
+def exercise_record(exercise):
+
+    return {
+        'id': exercise.id,
+        'name': exercise.name,
+        'muscle_group': exercise.muscle_group,
+        'equipment': exercise.equipment_needed,
+        'description': exercise.description,
+        'is_custom': bool(exercise.is_custom),
+        'usage_count': exercise.usage_count,
+    }
+
+
+def workout_record(workout):
+
+    return {
+        'workout_id': workout.id,
+        'date': workout.workout_date,
+        'notes': workout.notes,
+        'total_volume': workout.get_total_volume(),
+        'exercises': [
+            {
+                'name': we.get_exercise_name(),
+                'sets': we.sets,
+                'reps': we.reps,
+                'weight': we.weight,
+                'notes': we.notes,
+            }
+            for we in workout.workout_exercises
+        ],
+    }
+
+
+def require_user(session, user_id):
+
+    user = session.get(User, user_id)
+    if user is None:
+        raise NotFound(f"No user with id {user_id}")
+    return user
+
+
+def create_user(session, name, age=None, weight=None, fitness_goal=None):
+
+    name = (name or '').strip()
+    if not name:
+        raise ServiceError("Name cannot be empty")
+    if len(name) > 100:
+        raise ServiceError("Name must be 100 characters or fewer")
+    # bool is a subclass of int, so JSON true/false would pass isinstance.
+    if age is not None and (isinstance(age, bool) or not isinstance(age, int) or age < 0):
+        raise ServiceError("Age must be a non-negative whole number")
+    if weight is not None and (isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0):
+        raise ServiceError("Weight must be a positive number")
+
+    user = User(name=name, age=age, weight=weight, fitness_goal=fitness_goal or None)
+    session.add(user)
+    session.commit()
+    return user_record(user)
+
+
+def list_users(session):
+
+    rows = session.execute(
+        select(User, UserStats)
+        .outerjoin(UserStats, UserStats.user_id == User.id)
+        .order_by(User.id)
+    )
+    return [user_record(user, stats) for user, stats in rows]
+
+
+def get_user(session, user_id):
+
+    user = require_user(session, user_id)
+    return user_record(user, user.stats)
+
+
+def get_statistics(session, user_id, top_n=5):
+
+    user = require_user(session, user_id)
+    # A negative LIMIT is no limit at all in SQLite.
+    if not 1 <= top_n <= MAX_PAGE_SIZE:
+        raise ServiceError(f"top must be between 1 and {MAX_PAGE_SIZE}")
+    stats = get_user_statistics(session, user.id, top_n=top_n)
+    return {
+        'user_id': user.id,
+        'name': user.name,
+        'total_workouts': stats.total_workouts,
+        'total_exercises': stats.total_exercises,
+        'total_volume': stats.total_volume,
+        'first_workout': stats.earliest_workout,
+        'last_workout': stats.latest_workout,
+        'days_active': stats.days_active,
+        'workouts_per_week': round(stats.workouts_per_week, 2),
+        'top_exercises': [{'name': name, 'sessions': count} for name, count in stats.top_exercises],
+    }
+
+
+def get_workout_history(session, user_id, limit=HISTORY_PAGE_SIZE, after=None):
+    # One page of workouts, newest first. `after` is the `next` cursor of
+    # the previous page.
+
+    require_user(session, user_id)
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ServiceError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    workouts, has_more = get_workout_page(session, user_id, limit, after=parse_cursor(after))
+    return {
+        'workouts': [workout_record(workout) for workout in workouts],
+        'next': format_cursor(workout_cursor(workouts[-1])) if has_more else None,
+    }
+
+
+def log_workout(session, user_id, exercises, workout_date=None, notes=None, duration=None):
+    # exercises: dicts with 'exercise' (name) or 'exercise_id', 'sets',
+    # 'reps', 'weight' and optional 'notes'.
+
+    require_user(session, user_id)
+    workout_date = parse_date(workout_date)
+
+    if not exercises:
+        raise ServiceError("A workout needs at least one exercise")
+    if duration is not None and (isinstance(duration, bool) or not isinstance(duration, int) or duration < 0):
+        raise ServiceError("Duration must be a non-negative whole number")
+    if notes is not None and not isinstance(notes, str):
+        raise ServiceError("Notes must be text")
+
+    names = {str(entry.get('exercise', '')).strip().lower() for entry in exercises if 'exercise_id' not in entry}
+    by_name = {
+        exercise.name.lower(): exercise
+        for exercise in session.scalars(select(Exercise).where(func.lower(Exercise.name).in_(names)))
+    }
+
+    draft = WorkoutDraft(user_id=user_id, workout_date=workout_date, notes=notes, duration=duration)
+    for entry in exercises:
+        if 'exercise_id' in entry:
+            exercise = session.get(Exercise, entry['exercise_id'])
+        else:
+            exercise = by_name.get(str(entry.get('exercise', '')).strip().lower())
+        if exercise is None:
+            raise ServiceError(f"Unknown exercise '{entry.get('exercise_id', entry.get('exercise'))}'")
+
+        try:
+            sets, reps, weight = int(entry['sets']), int(entry['reps']), float(entry['weight'])
+        except (KeyError, TypeError, ValueError):
+            raise ServiceError(f"'{exercise.name}' needs whole-number sets and reps and a weight")
+        # float() also accepts 'nan', 'inf' and 1e400.
+        if sets < 1 or reps < 1 or not math.isfinite(weight) or weight < 0:
+            raise ServiceError(f"'{exercise.name}' needs at least 1 set and 1 rep and a non-negative weight")
+        if entry.get('notes') is not None and not isinstance(entry['notes'], str):
+            raise ServiceError(f"Notes for '{exercise.name}' must be text")
+
+        draft.add_exercise(exercise, sets, reps, weight, entry.get('notes'))
+
+    workout_id = draft.save(session)
+    return {
+        'workout_id': workout_id,
+        'user_id': user_id,
+        'date': workout_date,
+        'exercises': len(draft.workout_exercises),
+        'total_volume': draft.get_total_volume(),
+    }
+
+
+def delete_workout(session, user_id, workout_id):
+
+    require_user(session, user_id)
+    workout = session.get(Workout, workout_id)
+    if workout is None or workout.user_id != user_id:
+        raise NotFound(f"No workout with id {workout_id} for user {user_id}")
+
+    deleted = (user_id, workout.workout_date, workout_entries(workout.workout_exercises))
+    session.delete(workout)
+    session.flush()
+    retract_workouts(session, [deleted])
+    session.commit()
+    return {'workout_id': workout_id, 'user_id': user_id}
+
+
+def search_exercises(session, term=None, muscle_group=None, popular=False, user_id=None, limit=None):
+    # popular=True orders the matches by how often they're logged, gym-wide
+    # or, with user_id, by that user. With no term or muscle group it
+    # browses the library that way; per user, only what they have logged.
+
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ServiceError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if user_id is not None:
+        require_user(session, user_id)
+
+    if not term and not muscle_group:
+        if not popular:
+            raise ServiceError("Give a search term or a muscle group")
+        if user_id is not None:
+            return [
+                dict(exercise_record(exercise), user_usage_count=count)
+                for exercise, count in get_most_used_exercises(session, user_id, limit=limit)
+            ]
+        return [exercise_record(exercise) for exercise in Exercise.most_popular(session, limit=limit)]
+
+    if muscle_group:
+        exercises = Exercise.filter_by_muscle_group(session, muscle_group)
+        if term:
+            exercises = [e for e in exercises if term.lower() in e.name.lower()]
+    else:
+        exercises = Exercise.search_by_name(session, term)
+
+    records = [exercise_record(exercise) for exercise in exercises]
+    if user_id is not None:
+        usage = get_exercise_usage(session, user_id)
+        for record in records:
+            record['user_usage_count'] = usage.get(record['id'], 0)
+
+    if popular:
+        count = 'user_usage_count' if user_id is not None else 'usage_count'
+        records.sort(key=lambda record: (-record[count], record['name']))
+    return records[:limit] if limit else records
@@ -0,0 +1,193 @@
+from dataclasses import dataclass, field
+from sqlalchemy import select, func
+from lib.models import User, Workout, WorkoutExercise, Exercise, ExerciseUsage, UserStats, PersonalRecord
+
+
+@dataclass
+class UserStatistics:
+
+    total_workouts: int = 0
+    total_exercises: int = 0
+    total_volume: float = 0.0
+    earliest_workout: object = None
+    latest_workout: object = None
+    top_exercises: list = field(default_factory=list)
+
+    @property
+    def days_active(self):
+
+        if not self.earliest_workout or not self.latest_workout:
+            return 0
+        return (self.latest_workout - self.earliest_workout).days + 1
+
+    @property
+    def workouts_per_week(self):
+
+        weeks_active = self.days_active / 7
+        return self.total_workouts / weeks_active if weeks_active > 0 else 0
+
+
+@dataclass(frozen=True, slots=True)
+class UserRow:
+
+    id: int
+    name: str
+    age: int = None
+    weight: float = None
+    fitness_goal: str = None
+    workout_count: int = 0
+
+
+def get_user_rows(session):
+
+    rows = session.execute(
+        select(
+            User.id,
+            User.name,
+            User.age,
+            User.weight,
+            User.fitness_goal,
+            func.coalesce(UserStats.workout_count, 0)
+        )
+        .outerjoin(UserStats, UserStats.user_id == User.id)
+        .order_by(User.id)
+    )
+    return [UserRow(*row) for row in rows]
+
+
+def get_workout_totals(session, user_id):
+
+    return session.execute(
+        select(
+            func.count(Workout.id),
+            func.min(Workout.workout_date),
+            func.max(Workout.workout_date)
+        ).where(Workout.user_id == user_id)
+    ).one()
+
+
+def get_exercise_totals(session, user_id):
+
+    return session.execute(
+        select(
+            func.count(WorkoutExercise.id),
+            func.coalesce(
+                func.sum(WorkoutExercise.sets * WorkoutExercise.reps * WorkoutExercise.weight),
+                0.0
+            )
+        ).join(Workout, WorkoutExercise.workout_id == Workout.id)
+        .where(Workout.user_id == user_id)
+    ).one()
+
+
+def get_top_exercises(session, user_id, limit=5):
+
+    session_count = func.count(WorkoutExercise.id).label('session_count')
+
+    rows = session.execute(
+        select(Exercise.name, session_count)
+        .join(WorkoutExercise, WorkoutExercise.exercise_id == Exercise.id)
+        .join(Workout, WorkoutExercise.workout_id == Workout.id)
+        .where(Workout.user_id == user_id)
+        .group_by(Exercise.id, Exercise.name)
+        .order_by(session_count.desc(), Exercise.name)
+        .limit(limit)
+    ).all()
+
+    return [(name, count) for name, count in rows]
+
+
+def get_user_summary(session, user_id):
+    # (workouts, exercises, volume, first date, last date) from the
+    # user_stats row, falling back to aggregating raw rows when the user
+    # has no summary yet (e.g. a database created before user_stats).
+
+    summary = session.execute(
+        select(
+            UserStats.workout_count,
+            UserStats.exercise_count,
+            UserStats.total_volume,
+            UserStats.first_workout_date,
+            UserStats.last_workout_date
+        ).where(UserStats.user_id == user_id)
+    ).first()
+
+    if summary is not None:
+        return tuple(summary)
+
+    total_workouts, earliest, latest = get_workout_totals(session, user_id)
+    if not total_workouts:
+        return (0, 0, 0.0, None, None)
+
+    total_exercises, total_volume = get_exercise_totals(session, user_id)
+    return (total_workouts, total_exercises, float(total_volume), earliest, latest)
+
+
+def get_user_statistics(session, user_id, top_n=5):
+
+    total_workouts, total_exercises, total_volume, earliest, latest = get_user_summary(session, user_id)
+
+    if not total_workouts:
+        return UserStatistics()
+
+    return UserStatistics(
+        total_workouts=total_workouts,
+        total_exercises=total_exercises,
+        total_volume=float(total_volume),
+        earliest_workout=earliest,
+        latest_workout=latest,
+        top_exercises=get_top_exercises(session, user_id, limit=top_n)
+    )
+
+
+def personal_record_query(user_id):
+
+    return (
+        select(
+            Exercise.name,
+            Exercise.muscle_group,
+            PersonalRecord.max_weight,
+            PersonalRecord.reps_at_max_weight,
+            PersonalRecord.max_set_volume,
+            PersonalRecord.estimated_one_rep_max
+        )
+        .join(Exercise, PersonalRecord.exercise_id == Exercise.id)
+        .where(PersonalRecord.user_id == user_id)
+    )
+
+
+def get_personal_records(session, user_id):
+
+    return session.execute(
+        personal_record_query(user_id).order_by(Exercise.muscle_group, Exercise.name)
+    ).all()
+
+
+def get_personal_record(session, user_id, exercise_id):
+
+    return session.execute(
+        personal_record_query(user_id).where(PersonalRecord.exercise_id == exercise_id)
+    ).first()
+
+
+def get_exercise_usage(session, user_id):
+    # {exercise_id: times logged} for one user.
+
+    return dict(session.execute(
+        select(ExerciseUsage.exercise_id, ExerciseUsage.usage_count).where(ExerciseUsage.user_id == user_id)
+    ).all())
+
+
+def get_most_used_exercises(session, user_id, limit=None):
+    # (Exercise, times logged) for the exercises one user has logged, most
+    # used first.
+
+    query = (
+        select(Exercise, ExerciseUsage.usage_count)
+        .join(ExerciseUsage, ExerciseUsage.exercise_id == Exercise.id)
+        .where(ExerciseUsage.user_id == user_id)
+        .order_by(ExerciseUsage.usage_count.desc(), Exercise.name)
+    )
+    if limit:
+        query = query.limit(limit)
+    return session.execute(query).all()
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from sqlalchemy import select, func, distinct
+from lib.models import TrainingRollup
+from lib.aggregates import ROLLUP_PERIODS, period_start
+
+# Training trends read from the training_rollups table, one row per period
+# and muscle group, so a trend over N periods touches O(N) rows no matter
+# how many sets were logged.
+
+
+@dataclass
+class TrendPoint:
+
+    period_start: date
+    total_volume: float = 0.0
+    total_sets: int = 0
+    total_reps: int = 0
+
+
+def previous_period_start(period, start):
+
+    if period == 'month':
+        return (start - timedelta(days=1)).replace(day=1)
+    if period == 'week':
+        return start - timedelta(weeks=1)
+    return start - timedelta(days=1)
+
+
+def recent_period_starts(period, count, today=None):
+    # The last `count` period starts, oldest first, ending with the current one.
+
+    start = period_start(period, today or date.today())
+    starts = [start]
+    for _ in range(count - 1):
+        start = previous_period_start(period, start)
+        starts.append(start)
+    return starts[::-1]
+
+
+def get_volume_trend(session, user_id, period='week', periods=12, muscle_group=None, today=None):
+
+    if period not in ROLLUP_PERIODS:
+        raise ValueError(f"Unknown period '{period}' (choose from {', '.join(ROLLUP_PERIODS)})")
+
+    starts = recent_period_starts(period, periods, today)
+
+    query = (
+        select(
+            TrainingRollup.period_start,
+            func.sum(TrainingRollup.total_volume),
+            func.sum(TrainingRollup.total_sets),
+            func.sum(TrainingRollup.total_reps)
+        )
+        .where(
+            TrainingRollup.user_id == user_id,
+            TrainingRollup.period == period,
+            TrainingRollup.period_start >= starts[0]
+        )
+        .group_by(TrainingRollup.period_start)
+    )
+    if muscle_group:
+        query = query.where(TrainingRollup.muscle_group == muscle_group)
+
+    totals = {start: (volume, sets, reps) for start, volume, sets, reps in session.execute(query)}
+
+    return [TrendPoint(start, *totals.get(start, (0.0, 0, 0))) for start in starts]
+
+
+def get_muscle_group_breakdown(session, user_id, period='month', today=None):
+    # (muscle_group, volume) for the current period, largest first.
+
+    start = period_start(period, today or date.today())
+    return session.execute(
+        select(TrainingRollup.muscle_group, TrainingRollup.total_volume)
+        .where(
+            TrainingRollup.user_id == user_id,
+            TrainingRollup.period == period,
+            TrainingRollup.period_start == start
+        )
+        .order_by(TrainingRollup.total_volume.desc())
+    ).all()
+
+
+def get_trained_muscle_groups(session, user_id):
+
+    return session.scalars(
+        select(distinct(TrainingRollup.muscle_group))
+        .where(TrainingRollup.user_id == user_id, TrainingRollup.period == 'month')
+        .order_by(TrainingRollup.muscle_group)
+    ).all()
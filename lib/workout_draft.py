@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from sqlalchemy import insert
+from lib.models import Workout, WorkoutExercise
+from lib.aggregates import apply_workout
+
+
+@dataclass
+class DraftEntry:
+
+    exercise_id: int
+    exercise_name: str
+    sets: int
+    reps: int
+    weight: float
+    notes: str = None
+
+    def calculate_volume(self):
+
+        return self.sets * self.reps * self.weight
+
+    def get_exercise_name(self):
+
+        return self.exercise_name
+
+
+@dataclass
+class WorkoutDraft:
+    # A workout being entered. Nothing touches the session until save(),
+    # which writes the workout, all of its exercises and the summary
+    # updates in one short transaction.
+
+    user_id: int
+    workout_date: object
+    notes: str = None
+    duration: int = None
+    workout_exercises: list = field(default_factory=list)
+    workout_id: int = None
+
+    def add_exercise(self, exercise, sets, reps, weight, notes=None):
+
+        entry = DraftEntry(
+            exercise_id=exercise.id,
+            exercise_name=exercise.name,
+            sets=sets,
+            reps=reps,
+            weight=weight,
+            notes=notes
+        )
+        self.workout_exercises.append(entry)
+        return entry
+
+    def get_total_volume(self):
+
+        return sum(entry.calculate_volume() for entry in self.workout_exercises)
+
+    def entries(self):
+
+        return [(e.exercise_id, e.sets, e.reps, e.weight) for e in self.workout_exercises]
+
+    def discard(self):
+
+        self.workout_exercises.clear()
+
+    def save(self, session):
+
+        try:
+            self.workout_id = session.execute(
+                insert(Workout).returning(Workout.id),
+                [{
+                    'user_id': self.user_id,
+                    'workout_date': self.workout_date,
+                    'duration': self.duration,
+                    'notes': self.notes
+                }]
+            ).scalar_one()
+
+            if self.workout_exercises:
+                session.execute(insert(WorkoutExercise.__table__), [
+                    {
+                        'workout_id': self.workout_id,
+                        'exercise_id': entry.exercise_id,
+                        'sets': entry.sets,
+                        'reps': entry.reps,
+                        'weight': entry.weight,
+                        'notes': entry.notes
+                    }
+                    for entry in self.workout_exercises
+                ])
+
+            apply_workout(session, self.user_id, self.workout_date, self.entries())
+            session.commit()
+        except Exception:
+            session.rollback()
+            self.workout_id = None
+            raise
+
+        return self.workout_id
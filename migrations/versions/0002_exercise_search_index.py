@@ -0,0 +1,76 @@
+"""exercise search index
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The index as of this revision; later revisions change it themselves.
+SEARCH_TABLE = 'exercises_fts'
+
+CREATE_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(
+        name, description, equipment_needed,
+        content='exercises', content_rowid='id',
+        prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_insert AFTER INSERT ON exercises BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description, equipment_needed)
+        VALUES (new.id, new.name, new.description, new.equipment_needed);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_delete AFTER DELETE ON exercises BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description, equipment_needed)
+        VALUES ('delete', old.id, old.name, old.description, old.equipment_needed);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_update AFTER UPDATE ON exercises BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description, equipment_needed)
+        VALUES ('delete', old.id, old.name, old.description, old.equipment_needed);
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description, equipment_needed)
+        VALUES (new.id, new.name, new.description, new.equipment_needed);
+    END
+    """,
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    if 'ENABLE_FTS5' not in bind.execute(sa.text("PRAGMA compile_options")).scalars().all():
+        return
+    exists = bind.execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': SEARCH_TABLE}
+    ).first()
+    if exists is None:
+        for statement in CREATE_STATEMENTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in ('exercises_fts_insert', 'exercises_fts_delete', 'exercises_fts_update'):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
@@ -0,0 +1,37 @@
+"""indexes for the hot query paths
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ('ix_workouts_user_id_workout_date', 'workouts', ['user_id', 'workout_date']),
+    ('ix_exercises_muscle_group', 'exercises', ['muscle_group']),
+    ('ix_workout_exercises_workout_id', 'workout_exercises', ['workout_id']),
+    ('ix_workout_exercises_exercise_id_workout_id', 'workout_exercises', ['exercise_id', 'workout_id']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
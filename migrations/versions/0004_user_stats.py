@@ -0,0 +1,48 @@
+"""per-user summary table
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('workout_count', sa.Integer(), nullable=False),
+        sa.Column('exercise_count', sa.Integer(), nullable=False),
+        sa.Column('total_volume', sa.Float(), nullable=False),
+        sa.Column('first_workout_date', sa.Date(), nullable=True),
+        sa.Column('last_workout_date', sa.Date(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.execute("""
+        INSERT INTO user_stats (user_id, workout_count, exercise_count, total_volume,
+                                first_workout_date, last_workout_date, updated_at)
+        SELECT workouts.user_id, count(DISTINCT workouts.id), count(workout_exercises.id),
+               coalesce(sum(workout_exercises.sets * workout_exercises.reps * workout_exercises.weight), 0.0),
+               min(workouts.workout_date), max(workouts.workout_date), CURRENT_TIMESTAMP
+        FROM workouts LEFT OUTER JOIN workout_exercises ON workout_exercises.workout_id = workouts.id
+        GROUP BY workouts.user_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_stats')
@@ -0,0 +1,62 @@
+"""personal record index
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 10:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'personal_records',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('max_weight', sa.Float(), nullable=False),
+        sa.Column('reps_at_max_weight', sa.Integer(), nullable=False),
+        sa.Column('max_set_volume', sa.Float(), nullable=False),
+        sa.Column('estimated_one_rep_max', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'exercise_id'),
+    )
+    # Heaviest set per user and exercise (most reps breaking ties), best
+    # set volume and best Epley estimate.
+    op.execute("""
+        INSERT INTO personal_records (user_id, exercise_id, max_weight, reps_at_max_weight,
+                                      max_set_volume, estimated_one_rep_max, updated_at)
+        SELECT user_id, exercise_id, weight, reps, max_set_volume, estimated_one_rep_max, CURRENT_TIMESTAMP
+        FROM (
+            SELECT workouts.user_id AS user_id, workout_exercises.exercise_id AS exercise_id,
+                   workout_exercises.weight AS weight, workout_exercises.reps AS reps,
+                   max(workout_exercises.reps * workout_exercises.weight)
+                       OVER (PARTITION BY workouts.user_id, workout_exercises.exercise_id) AS max_set_volume,
+                   max(CASE WHEN workout_exercises.reps <= 1 THEN workout_exercises.weight
+                            ELSE workout_exercises.weight * (1 + workout_exercises.reps / 30.0) END)
+                       OVER (PARTITION BY workouts.user_id, workout_exercises.exercise_id) AS estimated_one_rep_max,
+                   row_number() OVER (
+                       PARTITION BY workouts.user_id, workout_exercises.exercise_id
+                       ORDER BY workout_exercises.weight DESC, workout_exercises.reps DESC
+                   ) AS position
+            FROM workout_exercises JOIN workouts ON workout_exercises.workout_id = workouts.id
+        )
+        WHERE position = 1
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('personal_records')
@@ -0,0 +1,61 @@
+"""training rollups
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Start of each period in SQLite date() terms; weeks start on Monday.
+PERIOD_STARTS = (
+    ('day', "date(workouts.workout_date)"),
+    ('week', "date(workouts.workout_date, 'weekday 0', '-6 days')"),
+    ('month', "date(workouts.workout_date, 'start of month')"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'training_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=5), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('muscle_group', sa.String(length=50), nullable=False),
+        sa.Column('total_volume', sa.Float(), nullable=False),
+        sa.Column('total_sets', sa.Integer(), nullable=False),
+        sa.Column('total_reps', sa.Integer(), nullable=False),
+        sa.Column('exercise_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'period', 'period_start', 'muscle_group'),
+    )
+    for period, start in PERIOD_STARTS:
+        op.execute(f"""
+            INSERT INTO training_rollups (user_id, period, period_start, muscle_group,
+                                          total_volume, total_sets, total_reps, exercise_count)
+            SELECT workouts.user_id, '{period}', {start}, exercises.muscle_group,
+                   sum(workout_exercises.sets * workout_exercises.reps * workout_exercises.weight),
+                   sum(workout_exercises.sets), sum(workout_exercises.sets * workout_exercises.reps),
+                   count(workout_exercises.id)
+            FROM workout_exercises
+            JOIN workouts ON workout_exercises.workout_id = workouts.id
+            JOIN exercises ON workout_exercises.exercise_id = exercises.id
+            GROUP BY workouts.user_id, {start}, exercises.muscle_group
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('training_rollups')
@@ -0,0 +1,50 @@
+"""exercise usage counts
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('exercises', sa.Column('usage_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_table(
+        'exercise_usage',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('usage_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'exercise_id'),
+    )
+    op.execute("""
+        INSERT INTO exercise_usage (user_id, exercise_id, usage_count)
+        SELECT workouts.user_id, workout_exercises.exercise_id, count(workout_exercises.id)
+        FROM workout_exercises JOIN workouts ON workout_exercises.workout_id = workouts.id
+        GROUP BY workouts.user_id, workout_exercises.exercise_id
+    """)
+    op.execute("""
+        UPDATE exercises SET usage_count = (
+            SELECT coalesce(sum(exercise_usage.usage_count), 0)
+            FROM exercise_usage WHERE exercise_usage.exercise_id = exercises.id
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('exercise_usage')
+    op.drop_column('exercises', 'usage_count')
@@ -0,0 +1,60 @@
+"""search index update trigger on indexed columns only
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_TABLE = 'exercises_fts'
+
+UPDATE_TRIGGER = f"""
+    CREATE TRIGGER IF NOT EXISTS exercises_fts_update
+    AFTER UPDATE OF name, description, equipment_needed ON exercises BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description, equipment_needed)
+        VALUES ('delete', old.id, old.name, old.description, old.equipment_needed);
+        INSERT INTO {SEARCH_TABLE}(rowid, name, description, equipment_needed)
+        VALUES (new.id, new.name, new.description, new.equipment_needed);
+    END
+"""
+
+
+def search_index_exists():
+
+    return op.get_bind().execute(
+        sa.text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': SEARCH_TABLE}
+    ).first() is not None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if search_index_exists():
+        op.execute("DROP TRIGGER IF EXISTS exercises_fts_update")
+        op.execute(UPDATE_TRIGGER)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if search_index_exists():
+        op.execute("DROP TRIGGER IF EXISTS exercises_fts_update")
+        op.execute(f"""
+            CREATE TRIGGER exercises_fts_update AFTER UPDATE ON exercises BEGIN
+                INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, name, description, equipment_needed)
+                VALUES ('delete', old.id, old.name, old.description, old.equipment_needed);
+                INSERT INTO {SEARCH_TABLE}(rowid, name, description, equipment_needed)
+                VALUES (new.id, new.name, new.description, new.equipment_needed);
+            END
+        """)
@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from lib.database import Base, create_tuned_engine
+from lib.models import Exercise, User
+from lib.search import install_search_index
+from lib.seed import exercise_rows
+
+
+@pytest.fixture
+def engine(tmp_path):
+
+    engine = create_tuned_engine(f"sqlite:///{tmp_path / 'fitness_tracker.db'}", profile='default')
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        install_search_index(connection)
+        connection.execute(insert(Exercise), exercise_rows())
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def make_user(session):
+
+    def make_user(name='Test User'):
+
+        user = User(name=name)
+        session.add(user)
+        session.commit()
+        return user.id
+
+    return make_user
@@ -0,0 +1,69 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from lib import services
+from lib.aggregates import rebuild_all
+from lib.models import Exercise, ExerciseUsage, PersonalRecord, TrainingRollup, UserStats, Workout
+from lib.workout_draft import WorkoutDraft
+
+
+def snapshot(session):
+    # Every summary row, minus the updated_at timestamps, with floats
+    # rounded so incremental and rebuilt sums compare equal.
+
+    def rows(*columns):
+
+        return sorted(
+            tuple(round(value, 6) if isinstance(value, float) else value for value in row)
+            for row in session.execute(select(*columns))
+        )
+
+    return {
+        'user_stats': rows(
+            UserStats.user_id, UserStats.workout_count, UserStats.exercise_count,
+            UserStats.total_volume, UserStats.first_workout_date, UserStats.last_workout_date
+        ),
+        'personal_records': rows(
+            PersonalRecord.user_id, PersonalRecord.exercise_id, PersonalRecord.max_weight,
+            PersonalRecord.reps_at_max_weight, PersonalRecord.max_set_volume,
+            PersonalRecord.estimated_one_rep_max
+        ),
+        'training_rollups': rows(
+            TrainingRollup.user_id, TrainingRollup.period, TrainingRollup.period_start,
+            TrainingRollup.muscle_group, TrainingRollup.total_volume, TrainingRollup.total_sets,
+            TrainingRollup.total_reps, TrainingRollup.exercise_count
+        ),
+        'exercise_usage': rows(ExerciseUsage.user_id, ExerciseUsage.exercise_id, ExerciseUsage.usage_count),
+        'exercises.usage_count': rows(Exercise.id, Exercise.usage_count),
+    }
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_incremental_summaries_match_rebuild(session, make_user, seed):
+
+    rng = random.Random(seed)
+    user_ids = [make_user(f"User {n}") for n in range(3)]
+    exercises = session.scalars(select(Exercise)).all()
+
+    for _ in range(60):
+        user_id = rng.choice(user_ids)
+        draft = WorkoutDraft(user_id=user_id, workout_date=date(2025, 1, 1) + timedelta(days=rng.randrange(90)))
+        for exercise in rng.sample(exercises, rng.randint(1, 5)):
+            weight = rng.choice([0, rng.randrange(5, 300, 5), rng.uniform(5, 300)])
+            draft.add_exercise(exercise, rng.randint(1, 5), rng.randint(1, 15), weight)
+        draft.save(session)
+
+    # Deletes go through the retract path instead of apply_workouts.
+    workout_ids = session.scalars(select(Workout.id)).all()
+    for workout_id in rng.sample(workout_ids, 10):
+        services.delete_workout(session, session.get(Workout, workout_id).user_id, workout_id)
+
+    incremental = snapshot(session)
+    assert all(incremental.values())
+    rebuild_all(session)
+    session.commit()
+
+    assert snapshot(session) == incremental
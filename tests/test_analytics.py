@@ -0,0 +1,35 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from lib.analytics import HAS_NUMPY, get_user_analytics
+from lib.helpers import calculate_one_rep_max
+from lib.models import Exercise
+from lib.workout_draft import WorkoutDraft
+
+SETS = [(1, 225), (5, 185), (8, 165), (12, 135)]
+
+
+@pytest.fixture
+def bench_user(session, make_user):
+
+    user_id = make_user()
+    bench = session.scalar(select(Exercise).where(Exercise.name == 'Bench Press'))
+    for day, (reps, weight) in enumerate(SETS):
+        draft = WorkoutDraft(user_id=user_id, workout_date=date(2025, 1, 1) + timedelta(days=day))
+        draft.add_exercise(bench, 3, reps, weight)
+        draft.save(session)
+    return user_id, bench.id
+
+
+@pytest.mark.parametrize('backend', ['python', pytest.param('numpy', marks=pytest.mark.skipif(
+    not HAS_NUMPY, reason="needs NumPy"))])
+def test_one_rep_max_curve_uses_helper(session, bench_user, backend):
+
+    user_id, exercise_id = bench_user
+    analytics = get_user_analytics(session, user_id, exercise_id=exercise_id, backend=backend)
+
+    assert [estimate for _, estimate in analytics.one_rep_max_curve] == pytest.approx(
+        [calculate_one_rep_max(weight, reps) for reps, weight in SETS]
+    )
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from lib import database
+from lib.commands import main
+from lib.database import create_tuned_engine, sessionLocal
+from lib.services import create_user
+
+
+@pytest.fixture
+def use_database(monkeypatch):
+    # Points the app's engine and sessions at another database file.
+
+    engines = []
+
+    def use_database(path):
+
+        engine = create_tuned_engine(f"sqlite:///{path}", profile='default')
+        engines.append(engine)
+        monkeypatch.setattr(database, 'engine', engine)
+        sessionLocal.configure(bind=engine)
+
+    yield use_database
+    sessionLocal.configure(bind=database.engine)
+    for engine in engines:
+        engine.dispose()
+
+
+def test_commands_migrate_a_new_database(tmp_path, use_database, capsys):
+
+    use_database(tmp_path / 'new.db')
+
+    assert main(['stats']) == 0
+    assert main(['log', '--user', '1', '--exercise', 'Bench Press:3:10:100']) == 1
+
+    out, err = capsys.readouterr()
+    assert out == ''
+    assert 'error: No user with id 1' in err
+
+
+def test_database_errors_exit_with_status_1(tmp_path, use_database, capsys):
+
+    path = tmp_path / 'broken.db'
+    path.write_bytes(b'not a database' * 1000)
+    use_database(path)
+
+    assert main(['stats']) == 1
+    assert 'error: database:' in capsys.readouterr().err
+
+
+def test_stats_output_is_json(tmp_path, use_database, capsys):
+
+    use_database(tmp_path / 'new.db')
+    main(['stats'])
+    capsys.readouterr()
+
+    with sessionLocal() as session:
+        create_user(session, 'Test User')
+    assert main(['stats']) == 0
+    assert json.loads(capsys.readouterr().out)['name'] == 'Test User'
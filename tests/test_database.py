@@ -0,0 +1,53 @@
+from datetime import date
+
+from alembic import command
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+
+from lib import database
+from lib.database import (
+    HEAD_REVISION, MIGRATIONS_DIR, alembic_config, create_tuned_engine, get_schema_revision, init_db
+)
+
+
+def test_head_revision_matches_migrations():
+
+    assert ScriptDirectory(MIGRATIONS_DIR).get_current_head() == HEAD_REVISION
+
+
+def test_init_db_upgrades_pre_migration_database(tmp_path, monkeypatch):
+
+    engine = create_tuned_engine(f"sqlite:///{tmp_path / 'old.db'}", profile='default')
+    with engine.begin() as connection:
+        # The tables as they were before migrations existed: no alembic_version.
+        command.upgrade(alembic_config(connection), '0001')
+        connection.execute(text("DROP TABLE alembic_version"))
+        connection.execute(text("INSERT INTO users (id, name) VALUES (1, 'Old User')"))
+        connection.execute(text(
+            "INSERT INTO exercises (id, name, muscle_group) VALUES (1, 'Bench Press', 'Chest')"
+        ))
+        connection.execute(text("INSERT INTO workouts (id, user_id, workout_date) VALUES (1, 1, :day)"),
+                           {'day': date(2025, 1, 1)})
+        connection.execute(text(
+            "INSERT INTO workout_exercises (workout_id, exercise_id, sets, reps, weight) VALUES (1, 1, 3, 10, 100)"
+        ))
+
+    monkeypatch.setattr(database, 'engine', engine)
+    init_db()
+
+    with engine.connect() as connection:
+        assert get_schema_revision(connection) == HEAD_REVISION
+        assert connection.execute(text("SELECT workout_count FROM user_stats")).scalar() == 1
+        assert connection.execute(text("SELECT usage_count FROM exercises")).scalar() == 1
+    engine.dispose()
+
+
+def test_init_db_stamps_new_database(tmp_path, monkeypatch):
+
+    engine = create_tuned_engine(f"sqlite:///{tmp_path / 'new.db'}", profile='default')
+    monkeypatch.setattr(database, 'engine', engine)
+    init_db()
+
+    with engine.connect() as connection:
+        assert get_schema_revision(connection) == HEAD_REVISION
+    engine.dispose()
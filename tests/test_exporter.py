@@ -0,0 +1,27 @@
+import io
+import os
+
+from lib import services
+from lib.exporter import export_workouts, read_columnar
+
+
+def test_read_columnar_from_a_pipe(session, make_user):
+
+    user_id = make_user()
+    services.log_workout(session, user_id, [
+        {'exercise': 'Bench Press', 'sets': 3, 'reps': 10, 'weight': 135},
+        {'exercise': 'Squat', 'sets': 5, 'reps': 5, 'weight': 225},
+    ], workout_date='2025-01-01')
+
+    exported = io.BytesIO()
+    export_workouts(session, exported, 'columnar')
+
+    # A pipe, like stdin, can't seek past the columns that aren't read.
+    read_end, write_end = os.pipe()
+    with os.fdopen(write_end, 'wb') as writer:
+        writer.write(exported.getvalue())
+    with os.fdopen(read_end, 'rb') as reader:
+        assert not reader.seekable()
+        groups = list(read_columnar(reader, columns=['exercise', 'weight']))
+
+    assert groups == [{'exercise': ['Bench Press', 'Squat'], 'weight': [135.0, 225.0]}]
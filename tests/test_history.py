@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, select
+
+from lib.history import get_workout_page, workout_cursor
+from lib.models import Exercise
+from lib.workout_draft import WorkoutDraft
+
+EXERCISES_PER_WORKOUT = 4
+
+
+@pytest.fixture
+def statements(engine):
+    # Every statement sent to the database while the fixture is active.
+
+    executed = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+
+        executed.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', count)
+
+
+def log_workouts(session, user_id, count):
+
+    exercises = session.scalars(select(Exercise).order_by(Exercise.id).limit(EXERCISES_PER_WORKOUT)).all()
+    for day in range(count):
+        draft = WorkoutDraft(user_id=user_id, workout_date=date(2025, 1, 1) + timedelta(days=day))
+        for exercise in exercises:
+            draft.add_exercise(exercise, 3, 10, 100 + day)
+        draft.save(session)
+
+
+@pytest.mark.parametrize('workouts', [1, 10])
+def test_history_page_costs_fixed_statements(session, make_user, statements, workouts):
+
+    user_id = make_user()
+    log_workouts(session, user_id, workouts)
+    session.expire_all()
+
+    statements.clear()
+    page, has_more = get_workout_page(session, user_id, page_size=10)
+
+    assert len(page) == workouts
+    assert not has_more
+    assert all(len(workout.workout_exercises) == EXERCISES_PER_WORKOUT for workout in page)
+    # One query for the page of workouts, one for all of their exercises.
+    assert len(statements) == 2
+
+
+def test_history_pages_follow_cursor(session, make_user):
+
+    user_id = make_user()
+    log_workouts(session, user_id, 5)
+
+    first, has_more = get_workout_page(session, user_id, page_size=3)
+    second, more_after = get_workout_page(session, user_id, page_size=3, after=workout_cursor(first[-1]))
+
+    assert has_more and not more_after
+    assert [w.workout_date.day for w in first + second] == [5, 4, 3, 2, 1]
@@ -0,0 +1,39 @@
+import io
+
+from sqlalchemy import select
+
+from lib.importer import import_workouts
+from lib.models import WorkoutExercise
+
+CSV = """user,date,exercise,sets,reps,weight
+{user},2025-01-01,Bench Press,3,10,135
+{user},2025-01-02,Bench Press,3,10,NaN
+{user},2025-01-03,Bench Press,3,10,inf
+{user},2025-01-04,Squat,3,5,-Infinity
+{user},2025-01-05,Squat,3,5,225
+"""
+
+JSONL = """{{"user": {user}, "date": "2025-01-01", "exercise": "Bench Press", "sets": 3, "reps": 10, "weight": 135}}
+not json
+[1, 2, 3]
+{{"user": {user}, "date": "2025-01-02", "exercise": "Squat", "sets": 3, "reps": 5, "weight": 1e400}}
+"""
+
+
+def test_import_skips_non_finite_weights(session, make_user):
+
+    user_id = make_user()
+    stats = import_workouts(session, io.StringIO(CSV.format(user=user_id)), 'csv', chunk_size=1)
+
+    assert stats.rows_imported == 2
+    assert stats.skipped == {'invalid values': 3}
+    assert session.scalars(select(WorkoutExercise.weight).order_by(WorkoutExercise.id)).all() == [135, 225]
+
+
+def test_import_skips_malformed_json_lines(session, make_user):
+
+    user_id = make_user()
+    stats = import_workouts(session, io.StringIO(JSONL.format(user=user_id)), 'jsonl')
+
+    assert stats.rows_imported == 1
+    assert stats.skipped == {'invalid values': 3}
@@ -0,0 +1,60 @@
+import pytest
+
+from lib import services
+from lib.services import MAX_PAGE_SIZE, ServiceError
+
+
+@pytest.mark.parametrize('fields', [{'age': True}, {'age': -1}, {'weight': False}, {'weight': 0}])
+def test_create_user_rejects_bad_numbers(session, fields):
+
+    with pytest.raises(ServiceError):
+        services.create_user(session, 'Test User', **fields)
+
+
+@pytest.mark.parametrize('top_n', [-1, 0, MAX_PAGE_SIZE + 1])
+def test_statistics_top_out_of_range(session, make_user, top_n):
+
+    with pytest.raises(ServiceError):
+        services.get_statistics(session, make_user(), top_n=top_n)
+
+
+@pytest.mark.parametrize('limit', [-1, 0, MAX_PAGE_SIZE + 1])
+def test_search_limit_out_of_range(session, limit):
+
+    with pytest.raises(ServiceError):
+        services.search_exercises(session, popular=True, limit=limit)
+
+
+@pytest.mark.parametrize('changes', [
+    {'weight': float('inf')},
+    {'weight': 1e400},
+    {'weight': 'NaN'},
+    {'weight': '-inf'},
+    {'notes': {'text': 'heavy'}},
+])
+def test_log_workout_rejects_bad_entries(session, make_user, changes):
+
+    entry = dict({'exercise': 'Bench Press', 'sets': 3, 'reps': 10, 'weight': 135}, **changes)
+    with pytest.raises(ServiceError):
+        services.log_workout(session, make_user(), [entry])
+
+
+@pytest.mark.parametrize('fields', [
+    {'duration': 'abc'},
+    {'duration': -5},
+    {'duration': True},
+    {'notes': ['not', 'text']},
+])
+def test_log_workout_rejects_bad_workout_fields(session, make_user, fields):
+
+    entry = {'exercise': 'Bench Press', 'sets': 3, 'reps': 10, 'weight': 135}
+    with pytest.raises(ServiceError):
+        services.log_workout(session, make_user(), [entry], **fields)
+
+
+def test_log_workout_accepts_duration_and_notes(session, make_user):
+
+    entry = {'exercise': 'Bench Press', 'sets': 3, 'reps': 10, 'weight': 135, 'notes': 'paused'}
+    record = services.log_workout(session, make_user(), [entry], duration=45, notes='felt strong')
+
+    assert record['exercises'] == 1